@@ -1624,10 +1624,13 @@ def plugins() -> None:
 @plugins.command("list")
 @click.option("--plugin-path", multiple=True, help="External plugin file or directory.")
 @click.option("--include-aliases", is_flag=True, help="Also show plugin aliases, when external plugins define them.")
-def list_plugins(plugin_path: tuple[str, ...], include_aliases: bool) -> None:
+@click.option("--category", default=None, help="Only list plugins in this category, for example fs or network.")
+def list_plugins(plugin_path: tuple[str, ...], include_aliases: bool, category: str | None) -> None:
     """List canonical registered builtin and external plugin names."""
     registry = build_builtin_registry(plugin_path)
-    for name in registry.names(include_aliases=include_aliases):
+    if category is not None and category not in registry.categories():
+        raise click.ClickException(f"unknown plugin category: {category} (known: {', '.join(registry.categories())})")
+    for name in registry.names(include_aliases=include_aliases, category=category):
         click.echo(name)
 
 
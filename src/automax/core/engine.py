@@ -14,6 +14,7 @@ import shlex
 from copy import deepcopy
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from functools import lru_cache
 import logging
 from pathlib import Path
 import re
@@ -35,7 +36,7 @@ from automax.core.state import StateStore
 from automax.core.templating import evaluate_value, render_mapping, render_value
 from automax.core.yaml_loader import load_yaml_file
 from automax.plugins.registry import PluginRegistry, build_builtin_registry
-from automax.plugins.remote_utils import prepare_sudo_password_command
+from automax.plugins.remote_utils import prepare_sudo_password_command, read_remote_output
 
 
 class AutomaxError(ValueError):
@@ -211,6 +212,15 @@ class AutomaxEngine:
             store.update_run_status(NodeStatus.FAILED)
             store.record_event("job_failed", payload={"error": self._mask_text(str(exc), secrets)})
             raise
+        finally:
+            self._close_ssh_sessions()
+
+    def _close_ssh_sessions(self) -> None:
+        # Persistent SSH clients live only as long as the run; injected
+        # managers (tests, embedding callers) may not pool at all.
+        close_all = getattr(self.ssh_manager, "close_all", None)
+        if close_all is not None:
+            close_all()
 
     def resume(
         self,
@@ -1628,9 +1638,9 @@ class AutomaxEngine:
         for target in targets:
             with self.ssh_manager.connect(target) as client:
                 _stdin, stdout, stderr = client.exec_command(DETECT_OS_COMMAND)
-                rc = stdout.channel.recv_exit_status()
-                out = stdout.read().decode("utf-8", errors="replace")
-                err = stderr.read().decode("utf-8", errors="replace")
+                rc, raw_out, raw_err = read_remote_output(stdout, stderr)
+                out = raw_out.decode("utf-8", errors="replace")
+                err = raw_err.decode("utf-8", errors="replace")
             if rc != 0 or not out.strip():
                 detail = self._mask_text((out + "\n" + err).strip(), secrets)
                 raise AutomaxError(f"OS detection failed for {target.name}: {detail}")
@@ -1679,9 +1689,9 @@ class AutomaxEngine:
             for tool in sorted(set(tools))
         ) + " exit 0"
         with self.ssh_manager.connect(target) as client:
-            _stdin, stdout, _stderr = client.exec_command(command)
-            stdout.channel.recv_exit_status()
-            out = stdout.read().decode("utf-8", errors="replace")
+            _stdin, stdout, stderr = client.exec_command(command)
+            _rc, raw_out, _raw_err = read_remote_output(stdout, stderr)
+            out = raw_out.decode("utf-8", errors="replace")
         return sorted({line.strip() for line in out.splitlines() if line.strip()})
 
     @staticmethod
@@ -1724,9 +1734,9 @@ class AutomaxEngine:
             if sudo_stdin:
                 stdin.write(sudo_stdin)
                 stdin.channel.shutdown_write()
-            rc = stdout.channel.recv_exit_status()
-            out = stdout.read().decode("utf-8", errors="replace")
-            err = stderr.read().decode("utf-8", errors="replace")
+            rc, raw_out, raw_err = read_remote_output(stdout, stderr)
+            out = raw_out.decode("utf-8", errors="replace")
+            err = raw_err.decode("utf-8", errors="replace")
         return rc, out, err
 
     def _run_capability_preflight(
@@ -1765,9 +1775,9 @@ class AutomaxEngine:
             ) + " exit $missing"
             with self.ssh_manager.connect(target) as client:
                 stdin, stdout, stderr = client.exec_command(command)
-                rc = stdout.channel.recv_exit_status()
-                out = stdout.read().decode("utf-8", errors="replace")
-                err = stderr.read().decode("utf-8", errors="replace")
+                rc, raw_out, raw_err = read_remote_output(stdout, stderr)
+                out = raw_out.decode("utf-8", errors="replace")
+                err = raw_err.decode("utf-8", errors="replace")
             if rc != 0:
                 detail = self._mask_text((out + "\n" + err).strip(), secrets)
                 raise AutomaxError(f"capability preflight failed for {target_name}: {detail}")
@@ -3172,10 +3182,6 @@ class AutomaxEngine:
         sudo_password: str | None = None,
         flow_vars: Dict[str, Any] | None = None,
     ) -> PluginResult:
-        effective_vars = deepcopy(variables)
-        effective_vars.update(target.vars)
-        effective_vars.update(step_state.get("vars", {}))
-        effective_vars.update(flow_vars or {})
         template_context = self._template_context(
             job=job,
             task=task,
@@ -3188,6 +3194,9 @@ class AutomaxEngine:
             step_state=step_state,
             flow_vars=flow_vars or {},
         )
+        # The template context already holds the merged per-target copy of
+        # the variables; the plugin gets the same mapping, not a second copy.
+        effective_vars = template_context["vars"]
         if not self._is_condition_true(substep.get("when"), template_context):
             return PluginResult.skipped_result("condition evaluated to false")
 
@@ -3377,13 +3386,20 @@ class AutomaxEngine:
         if expression == "stdout.trim":
             return str(result.get("stdout", "")).strip()
         current: Any = result
-        for part in expression.split("."):
+        for part in AutomaxEngine._register_path(expression):
             if isinstance(current, dict):
                 current = current.get(part)
             else:
                 return None
         return current
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _register_path(expression: str) -> tuple[str, ...]:
+        # The same register expressions are evaluated once per target and
+        # loop item; split each one only once.
+        return tuple(expression.split("."))
+
     def _result_to_mapping(
         self, result: PluginResult, *, secrets: Dict[str, Any] | None = None
     ) -> Dict[str, Any]:
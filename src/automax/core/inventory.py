@@ -7,11 +7,15 @@ Inventory parsing and target selection.
 
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
+import shlex
 from typing import Any, Dict, Iterable, List, Mapping, Sequence
 
 from automax.core.models import Target
 from automax.core.templating import render_mapping
+from automax.core.yaml_loader import load_yaml_file, safe_load
 
 
 class InventoryError(ValueError):
@@ -20,8 +24,6 @@ class InventoryError(ValueError):
 
 def load_inventory_document(path: str | Path, context: Dict[str, Any]) -> Dict[str, Any]:
     """Load a static or dynamic inventory document from an external YAML file."""
-    from automax.core.yaml_loader import load_yaml_file
-
     inventory_path = Path(path).expanduser().resolve()
     document = load_yaml_file(inventory_path)
     return resolve_inventory_document(document, base_dir=inventory_path.parent, context=context)
@@ -58,8 +60,6 @@ def _load_file_inventory(
     if not raw_path:
         raise InventoryError("file inventory provider requires 'path'")
     inventory_path = _resolve_relative_path(str(raw_path), base_dir)
-    from automax.core.yaml_loader import load_yaml_file
-
     return resolve_inventory_document(
         load_yaml_file(inventory_path),
         base_dir=inventory_path.parent,
@@ -142,9 +142,6 @@ def _load_http_inventory(
 def _parse_provider_payload(
     payload: str, *, provider: str, payload_format: str, context: Dict[str, Any]
 ) -> Dict[str, Any]:
-    import json
-    import yaml
-
     normalized_format = payload_format.strip().lower()
     if normalized_format not in {"auto", "yaml", "json"}:
         raise InventoryError("inventory provider format must be one of: auto, yaml, json")
@@ -152,7 +149,7 @@ def _parse_provider_payload(
         if normalized_format == "json":
             parsed = json.loads(payload)
         else:
-            parsed = yaml.safe_load(payload)
+            parsed = safe_load(payload)
     except Exception as exc:
         raise InventoryError(f"{provider} inventory provider returned invalid payload") from exc
     if not isinstance(parsed, dict):
@@ -164,8 +161,6 @@ def _parse_provider_payload(
 
 
 def _coerce_command(command: Any, *, shell: bool) -> Any:
-    import shlex
-
     if isinstance(command, list):
         if shell:
             raise InventoryError("command inventory provider cannot use a list with shell: true")
@@ -180,8 +175,6 @@ def _coerce_command(command: Any, *, shell: bool) -> Any:
 
 
 def _build_provider_env(extra_env: Any) -> Dict[str, str] | None:
-    import os
-
     if extra_env is None:
         return None
     if not isinstance(extra_env, Mapping):
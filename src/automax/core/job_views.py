@@ -6,8 +6,13 @@
 from __future__ import annotations
 
 from collections import OrderedDict
+from html import escape
+import json
+import re
 from typing import Any, Dict, Iterable, List
 
+_GRAPH_ID_UNSAFE = re.compile(r"[^A-Za-z0-9_]")
+
 
 def build_job_view(job: Dict[str, Any], plan: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Build a stable, serializable view from a resolved execution plan."""
@@ -163,7 +168,6 @@ def render_mermaid(view: Dict[str, Any]) -> str:
 
 def render_dot(view: Dict[str, Any]) -> str:
     """Render a Graphviz DOT graph for a planned job."""
-    import json
     lines = ["digraph automax_job {", "  rankdir=TB;", "  node [shape=box, style=rounded];"]
     job_id = _graph_id("job")
     lines.append(f"  {job_id} [label={json.dumps(view['job']['name'])}];")
@@ -186,7 +190,6 @@ def render_dot(view: Dict[str, Any]) -> str:
 
 def render_svg(view: Dict[str, Any]) -> str:
     """Render a dependency-free SVG graph."""
-    from html import escape
     rows: List[tuple[int, str]] = [(0, view["job"]["name"])]
     for task in view["tasks"]:
         rows.append((1, f"Task: {task['id']}"))
@@ -218,8 +221,7 @@ def render_svg(view: Dict[str, Any]) -> str:
 
 
 def _graph_id(value: str) -> str:
-    import re
-    cleaned = re.sub(r"[^A-Za-z0-9_]", "_", value)
+    cleaned = _GRAPH_ID_UNSAFE.sub("_", value)
     if not cleaned or cleaned[0].isdigit():
         cleaned = f"n_{cleaned}"
     return cleaned
@@ -11,6 +11,7 @@ small and explicit so new providers can be added without changing the execution
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import hashlib
 import os
 from pathlib import Path
 import shlex
@@ -18,10 +19,22 @@ import subprocess
 from typing import Any, Dict, Mapping
 
 
+# Per-process key so fingerprints cannot be compared across runs or brute-forced
+# offline from persisted state.
+_FINGERPRINT_KEY = os.urandom(32)
+
+
 class SecretProviderError(ValueError):
     """Raised when a secret cannot be resolved."""
 
 
+def secret_fingerprint(value: str | None) -> bytes:
+    """Return a fixed-width keyed digest usable as a cache key instead of plaintext."""
+    return hashlib.blake2b(
+        (value or "").encode("utf-8"), digest_size=16, key=_FINGERPRINT_KEY
+    ).digest()
+
+
 class SecretProvider(ABC):
     """Base interface for all secret providers."""
 
@@ -5,20 +5,24 @@
 SSH connection management.
 
 The engine opens one SSH connection per step and target, then executes all substeps for
-that step through the same connection.
+that step through the same connection. Targets can opt into keeping that connection
+open across steps with ``ssh.persistent: true``.
 """
 
 from __future__ import annotations
 
+import atexit
 from contextlib import contextmanager
 import os
 from pathlib import Path
 import socket
 import stat
 import tempfile
-from typing import Any
+import threading
+from typing import Any, Dict
 
 from automax.core.models import Target
+from automax.core.secrets import secret_fingerprint
 
 
 class SshError(RuntimeError):
@@ -30,19 +34,98 @@ class SshSessionManager:
 
     def __init__(self, *, connect_timeout: int = 20):
         self.connect_timeout = connect_timeout
+        self._pool: Dict[tuple, Any] = {}
+        self._pool_lock = threading.Lock()
+        self._atexit_registered = False
 
     @contextmanager
     def connect(self, target: Target):
-        """Open a new SSH client for one step/target scope."""
-        client = None
-        temp_key = None
+        """Open a new SSH client for one step/target scope.
+
+        Targets with ``ssh.persistent: true`` reuse one live client across
+        steps instead of paying a new handshake per step.
+        """
         try:
             import paramiko
         except ImportError as exc:
             raise SshError("paramiko is required for remote execution") from exc
 
+        if self._coerce_bool(target.ssh.get("persistent"), False):
+            with self._connect_pooled(target, paramiko) as client:
+                yield client
+            return
+
+        client = None
+        try:
+            client = self._open_client(target, paramiko)
+            yield client
+        except (socket.error, Exception) as exc:
+            raise SshError(f"SSH connection failed for {target.name}: {exc}") from exc
+        finally:
+            if client is not None:
+                client.close()
+
+    def close_all(self) -> None:
+        """Close every pooled persistent client."""
+        with self._pool_lock:
+            clients = list(self._pool.values())
+            self._pool.clear()
+        for client in clients:
+            client.close()
+
+    @contextmanager
+    def _connect_pooled(self, target: Target, paramiko: Any):
+        key = self._pool_key(target)
+        with self._pool_lock:
+            client = self._pool.pop(key, None)
+        if client is not None and not self._is_active(client):
+            client.close()
+            client = None
+        pooled = False
+        try:
+            if client is None:
+                client = self._open_client(target, paramiko)
+            yield client
+        except (socket.error, Exception) as exc:
+            raise SshError(f"SSH connection failed for {target.name}: {exc}") from exc
+        else:
+            with self._pool_lock:
+                stale = self._pool.get(key)
+                self._pool[key] = client
+                pooled = True
+                if not self._atexit_registered:
+                    atexit.register(self.close_all)
+                    self._atexit_registered = True
+            if stale is not None:
+                stale.close()
+        finally:
+            # A failed or interrupted step may leave the transport half-open;
+            # only a client that went back to the pool stays open.
+            if client is not None and not pooled:
+                client.close()
+
+    @staticmethod
+    def _pool_key(target: Target) -> tuple:
+        # Credentials are keyed by fingerprint so plaintext never lives in the key.
+        return (
+            target.host,
+            target.port,
+            target.user,
+            target.key_file,
+            secret_fingerprint(target.password),
+            secret_fingerprint(target.key_content),
+            target.ssh.get("known_hosts"),
+        )
+
+    @staticmethod
+    def _is_active(client: Any) -> bool:
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def _open_client(self, target: Target, paramiko: Any) -> Any:
+        client = paramiko.SSHClient()
+        temp_key = None
         try:
-            client = paramiko.SSHClient()
             self._configure_host_key_policy(client, target, paramiko)
 
             key_filename = self._resolve_key_filename(target)
@@ -68,12 +151,12 @@ class SshSessionManager:
                 look_for_keys=self._coerce_bool(target.ssh.get("look_for_keys"), False),
                 allow_agent=self._coerce_bool(target.ssh.get("allow_agent"), False),
             )
-            yield client
-        except (socket.error, Exception) as exc:
-            raise SshError(f"SSH connection failed for {target.name}: {exc}") from exc
+            return client
+        except BaseException:
+            client.close()
+            raise
         finally:
-            if client is not None:
-                client.close()
+            # The key is loaded during authentication; the file is not needed afterwards.
             if temp_key is not None:
                 Path(temp_key.name).unlink(missing_ok=True)
 
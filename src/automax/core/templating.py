@@ -8,37 +8,71 @@ Controlled Jinja2 rendering for job data structures.
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, Dict
-
-from jinja2 import Environment
-from jinja2 import StrictUndefined
-from jinja2 import UndefinedError
-from jinja2 import select_autoescape
-from jinja2.nativetypes import NativeEnvironment
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple
 
 
 class TemplateRenderError(ValueError):
     """Raised when a template cannot be rendered."""
 
 
-_NATIVE_TEMPLATE_ENV = NativeEnvironment(undefined=StrictUndefined)
+class _JinjaRuntime(NamedTuple):
+    native: Any
+    text: Any
+    undefined_error: type[Exception]
+
+
+@lru_cache(maxsize=None)
+def _jinja_runtime() -> _JinjaRuntime:
+    # jinja2 is imported on first render so commands that never template
+    # (help, plugin listing, schema export) do not pay for it.
+    from jinja2 import Environment
+    from jinja2 import StrictUndefined
+    from jinja2 import UndefinedError
+    from jinja2 import select_autoescape
+    from jinja2.nativetypes import NativeEnvironment
+
+    return _JinjaRuntime(
+        native=NativeEnvironment(undefined=StrictUndefined),
+        text=Environment(
+            autoescape=select_autoescape(
+                enabled_extensions=("html", "htm", "xml"),
+                default_for_string=False,
+                default=False,
+            ),
+            undefined=StrictUndefined,
+        ),
+        undefined_error=UndefinedError,
+    )
+
+
+# Jinja's default block, variable and comment openers.
+_JINJA_MARKERS = ("{{", "{%", "{#")
 
 
-_TEXT_TEMPLATE_ENV = Environment(
-    autoescape=select_autoescape(
-        enabled_extensions=("html", "htm", "xml"),
-        default_for_string=False,
-        default=False,
-    ),
-    undefined=StrictUndefined,
-)
+# from_string() lexes, parses and compiles on every call; the same template
+# strings recur across targets, steps and loop items, so keep compiled ones.
+@lru_cache(maxsize=2048)
+def _compile_text(template_source: str) -> Any:
+    return _jinja_runtime().text.from_string(template_source)
+
+
+@lru_cache(maxsize=2048)
+def _compile_native(template_source: str) -> Any:
+    return _jinja_runtime().native.from_string(template_source)
 
 
 def render_template_string(template_source: str, context: Dict[str, Any]) -> str:
     """Render a trusted text/config template with strict undefined variables."""
+    if "\r" not in template_source and not any(marker in template_source for marker in _JINJA_MARKERS):
+        # Without a Jinja delimiter the text is literal (shell braces such as
+        # ${HOME} or awk '{print $1}' included), so skip the engine and mirror
+        # what it would return: the text minus one trailing newline.
+        return template_source[:-1] if template_source.endswith("\n") else template_source
+    jinja = _jinja_runtime()
     try:
-        return _TEXT_TEMPLATE_ENV.from_string(template_source).render(**context)
-    except UndefinedError as exc:
+        return _compile_text(template_source).render(context)
+    except jinja.undefined_error as exc:
         raise TemplateRenderError(str(exc)) from exc
 
 
@@ -46,23 +80,36 @@ def evaluate_value(value: Any, context: Dict[str, Any]) -> Any:
     """Evaluate one trusted Jinja expression while preserving native Python types."""
     if not isinstance(value, str):
         return render_value(value, context)
+    jinja = _jinja_runtime()
     try:
-        return _NATIVE_TEMPLATE_ENV.from_string(value).render(**context)
-    except UndefinedError as exc:
+        return _compile_native(value).render(context)
+    except jinja.undefined_error as exc:
         raise TemplateRenderError(str(exc)) from exc
 
 
 def render_value(value: Any, context: Dict[str, Any]) -> Any:
     """Render strings recursively while preserving non-string values."""
-    if isinstance(value, str):
-        return render_template_string(value, context)
-    if isinstance(value, list):
-        return [render_value(item, context) for item in value]
-    if isinstance(value, dict):
-        return {key: render_value(item, context) for key, item in value.items()}
-    return value
+    return _render(value, context, _same)
 
 
 def render_mapping(data: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """Render a mapping without mutating the original object."""
-    return render_value(deepcopy(data), context)
+    # The walk already rebuilds every dict and list, so only the remaining
+    # leaves are copied instead of deep-copying the whole input first.
+    return _render(data, context, deepcopy)
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+def _render(value: Any, context: Dict[str, Any], leaf: Callable[[Any], Any]) -> Any:
+    # The context mapping is handed to Jinja as-is for every string leaf
+    # rather than unpacked into keyword arguments per call.
+    if isinstance(value, str):
+        return render_template_string(value, context)
+    if isinstance(value, list):
+        return [_render(item, context, leaf) for item in value]
+    if isinstance(value, dict):
+        return {key: _render(item, context, leaf) for key, item in value.items()}
+    return leaf(value)
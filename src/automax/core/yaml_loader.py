@@ -7,8 +7,14 @@ YAML loading helpers.
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from copy import deepcopy
+import hashlib
+import io
+import os
 from pathlib import Path
-from typing import Any, Dict
+import threading
+from typing import IO, Any, Dict
 
 import yaml
 
@@ -17,17 +23,56 @@ class YamlLoadError(ValueError):
     """Raised when a YAML file cannot be loaded as a mapping."""
 
 
+# libyaml's C scanner parses several times faster than the pure-Python one and
+# resolves the same safe tag set; fall back when PyYAML was built without it.
+_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Parsed mappings keyed by a digest of the file bytes. One command often loads
+# the same job, inventory or vars file more than once, and copying a parsed
+# mapping is several times cheaper than parsing it again.
+_PARSE_CACHE_SIZE = 64
+_parse_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def safe_load(text: str | bytes | IO[str]) -> Any:
+    """Parse one YAML document with the fastest available safe loader."""
+    return yaml.load(text, Loader=_SAFE_LOADER)  # noqa: S506 - safe loader only
+
+
 def load_yaml_file(path: str | Path, *, required: bool = True) -> Dict[str, Any]:
     """Load a YAML file and return a dictionary."""
     yaml_path = Path(path).expanduser().resolve()
-    if not yaml_path.exists():
+    # One sized read plus one decode avoids the incremental TextIOWrapper reads
+    # PyYAML would otherwise issue against a text stream. A missing file is
+    # detected by open() itself rather than a separate stat beforehand.
+    try:
+        with yaml_path.open("rb") as handle:
+            raw = handle.read(os.fstat(handle.fileno()).st_size)
+    except FileNotFoundError:
         if required:
-            raise YamlLoadError(f"YAML file not found: {yaml_path}")
+            raise YamlLoadError(f"YAML file not found: {yaml_path}") from None
         return {}
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+    if cached is not None:
+        return deepcopy(cached)
 
-    with yaml_path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+    # A named stream keeps the file path in parser error marks, as parsing
+    # from the open file did.
+    stream = io.StringIO(raw.decode("utf-8"))
+    stream.name = str(yaml_path)
+    data = safe_load(stream) or {}
 
     if not isinstance(data, dict):
         raise YamlLoadError(f"YAML root must be a mapping: {yaml_path}")
-    return data
+    with _parse_cache_lock:
+        _parse_cache[key] = data
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    # Callers own and may mutate the returned mapping; the cache keeps its own.
+    return deepcopy(data)
@@ -34,28 +34,44 @@ def _guarded(command: str, guard: Any | None) -> str:
     return f"{{ {body}; }}"
 
 
+# Suffix tables for compression "auto", checked with one str.endswith per
+# entry against the file name.
+_TAR_SUFFIX_COMPRESSION = (
+    ((".tar.gz", ".tgz"), "gzip"),
+    ((".tar.bz2", ".tbz2"), "bzip2"),
+    ((".tar.xz", ".txz"), "xz"),
+)
+_STREAM_SUFFIX_COMPRESSION = (
+    (".gz", "gzip"),
+    (".bz2", "bzip2"),
+    (".xz", "xz"),
+)
+_TAR_CREATE_FLAGS = {
+    "none": "-cf",
+    "gzip": "-czf",
+    "gz": "-czf",
+    "bzip2": "-cjf",
+    "bz2": "-cjf",
+    "xz": "-cJf",
+}
+_STREAM_TOOLS = {
+    "gzip": "gzip",
+    "gz": "gzip",
+    "bzip2": "bzip2",
+    "bz2": "bzip2",
+    "xz": "xz",
+    "zstd": "zstd",
+    "zst": "zstd",
+}
+
+
 def _tar_create_flag(dest: str, compression: str) -> str:
     selected = compression
     if selected == "auto":
-        suffixes = "".join(PurePosixPath(dest).suffixes)
-        if suffixes.endswith(".tar.gz") or dest.endswith(".tgz"):
-            selected = "gzip"
-        elif suffixes.endswith(".tar.bz2") or dest.endswith(".tbz2"):
-            selected = "bzip2"
-        elif suffixes.endswith(".tar.xz") or dest.endswith(".txz"):
-            selected = "xz"
-        else:
-            selected = "none"
-    mapping = {
-        "none": "-cf",
-        "gzip": "-czf",
-        "gz": "-czf",
-        "bzip2": "-cjf",
-        "bz2": "-cjf",
-        "xz": "-cJf",
-    }
+        name = PurePosixPath(dest).name
+        selected = next((kind for suffixes, kind in _TAR_SUFFIX_COMPRESSION if name.endswith(suffixes)), "none")
     try:
-        return mapping[selected]
+        return _TAR_CREATE_FLAGS[selected]
     except KeyError as exc:
         raise PluginValidationError(
             "data.archive.tar.create compression must be auto, none, gzip, bzip2 or xz"
@@ -69,31 +85,35 @@ def _tar_extract_flag(archive: str, compression: str) -> str:
     return create_flag.replace("c", "x", 1)
 
 
+def _parallel_gzip_setup(archive: str, compression: str, threads: Any | None) -> str:
+    """Return a shell prelude selecting pigz for gzip tar archives, or "".
+
+    Only gzip tarballs are affected and only when ``threads`` asks for more
+    than one thread. Targets without pigz keep using gzip.
+    """
+    if threads is None or int(threads) <= 1:
+        return ""
+    # _tar_create_flag resolves "auto" from the suffix, as tar -xf would.
+    if _tar_create_flag(archive, compression) != "-czf":
+        return ""
+    program = quote(f"pigz -p {int(threads)}")
+    return f"if command -v pigz >/dev/null 2>&1; then automax_inflate={program}; else automax_inflate=gzip; fi"
+
+
+_PARALLEL_GZIP_OPTION = '--use-compress-program="$automax_inflate"'
+
+
 def _stream_tool(path: str, compression: str, *, action: str) -> str:
     selected = compression
     if selected == "auto":
-        suffixes = "".join(PurePosixPath(path).suffixes)
-        if suffixes.endswith(".gz"):
-            selected = "gzip"
-        elif suffixes.endswith(".bz2"):
-            selected = "bzip2"
-        elif suffixes.endswith(".xz"):
-            selected = "xz"
-        else:
+        name = PurePosixPath(path).name
+        selected = next((kind for suffix, kind in _STREAM_SUFFIX_COMPRESSION if name.endswith(suffix)), "")
+        if not selected:
             raise PluginValidationError(
                 f"archive.{action} compression auto requires .gz, .bz2 or .xz suffix"
             )
-    mapping = {
-        "gzip": "gzip",
-        "gz": "gzip",
-        "bzip2": "bzip2",
-        "bz2": "bzip2",
-        "xz": "xz",
-        "zstd": "zstd",
-        "zst": "zstd",
-    }
     try:
-        return mapping[selected]
+        return _STREAM_TOOLS[selected]
     except KeyError as exc:
         raise PluginValidationError(
             f"archive.{action} compression must be auto, gzip, bzip2 or xz"
@@ -411,8 +431,9 @@ def _checksum_command(path: str, expected: str) -> str:
     return f"sha256sum {quote(path)} | awk '{{print $1}}' | grep -Fix -- {quote(expected)}"
 
 
-def _tar_safe_command(archive: str) -> str:
-    return f"tar -tf {quote(archive)} | awk 'BEGIN{{bad=0}} /^\\// || /(^|\\/)\\.\\.($|\\//) {{bad=1; print \"unsafe archive path: \" $0 > \"/dev/stderr\"}} END{{exit bad}}'"
+def _tar_safe_command(archive: str, option: str = "") -> str:
+    option = f"{option} " if option else ""
+    return f"tar {option}-tf {quote(archive)} | awk 'BEGIN{{bad=0}} /^\\// || /(^|\\/)\\.\\.($|\\//) {{bad=1; print \"unsafe archive path: \" $0 > \"/dev/stderr\"}} END{{exit bad}}'"
 
 
 def _zip_safe_command(archive: str) -> str:
@@ -430,12 +451,21 @@ def _post_extract_attrs(dest: str, params: Dict[str, Any]) -> list[str]:
 
 
 def _hardened_untar_command(self: ArchiveUntarPlugin, params: Dict[str, Any], context: ExecutionContext) -> str:
-    flag = _tar_extract_flag(str(params["archive"]), str(params.get("compression", "auto")))
+    compression = str(params.get("compression", "auto"))
+    flag = _tar_extract_flag(str(params["archive"]), compression)
     parts = []
+    inflate = _parallel_gzip_setup(str(params["archive"]), compression, params.get("threads"))
+    option = ""
+    if inflate:
+        # The safe-extract listing inflates the archive too, so both passes
+        # share the selected program.
+        parts.append(inflate)
+        flag = f"{_PARALLEL_GZIP_OPTION} -xf"
+        option = _PARALLEL_GZIP_OPTION
     if params.get("checksum_verify"):
         parts.append(_checksum_command(str(params["archive"]), str(params["checksum_verify"])))
     if bool(params.get("safe_extract", True)):
-        parts.append(_tar_safe_command(str(params["archive"])))
+        parts.append(_tar_safe_command(str(params["archive"]), option))
     strip = f"--strip-components={int(params['strip_components'])}" if "strip_components" in params else ""
     excludes = " ".join(f"--exclude={quote(item)}" for item in _as_list(params.get("exclude")))
     includes = " ".join(quote(item) for item in _as_list(params.get("include")))
@@ -462,7 +492,7 @@ def _hardened_unzip_command(self: ArchiveUnzipPlugin, params: Dict[str, Any], co
 class HardenedArchiveUntarPlugin(ArchiveUntarPlugin):
     """data.archive.tar.extract with checksum, safe extraction and ownership controls."""
 
-    optional_params = ("compression", "strip_components", "creates", "cwd", "safe_extract", "checksum_verify", "include", "exclude", "owner", "group", "mode")
+    optional_params = ("compression", "strip_components", "creates", "cwd", "safe_extract", "checksum_verify", "include", "exclude", "owner", "group", "mode", "threads")
 
     def _command(self, params: Dict[str, Any], context: ExecutionContext) -> str:
         return _hardened_untar_command(self, params, context)
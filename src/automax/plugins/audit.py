@@ -140,6 +140,8 @@ def sample_params(plugin: Any) -> dict[str, Any]:
         params["connection"] = {"path": "/tmp/automax.sqlite"}
     if plugin.name in {"data.backup.prune", "data.restore.apply", "data.backup.rotate", "network.firewall.iptables.restore", "storage.lvm.lv.remove", "storage.lvm.pv.remove", "storage.lvm.vg.remove", "system.host.reboot", "system.host.poweroff"}:
         params["confirm"] = True
+    if plugin.name == "command.local.run":
+        params["shell"] = False
     if plugin.name == "automax.plugin.requirements":
         params["plugin"] = "data.transfer.rsync"
     if plugin.name == "data.backup.directory.create":
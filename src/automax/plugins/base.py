@@ -9,11 +9,32 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
+from difflib import unified_diff
+from types import MappingProxyType
 from typing import Any, Dict
 
 from automax.core.models import ExecutionContext, PluginResult
+from automax.plugins.manual_preview import fallback_diff_preview, fallback_dry_run_data, fallback_manual_commands
+from automax.plugins.remote_utils import (
+    CHANGE_MARKER,
+    cleanup_trap_command,
+    exec_remote,
+    heredoc_to_file_expr,
+    quote,
+    result_from_remote,
+    shell_var_ref,
+    sudo_prefix,
+    tempfile_command,
+)
 from automax.plugins.validation import PluginValidationError
 
+_KNOWN_PARAMETER_TYPES = frozenset(
+    ("string", "path", "boolean", "integer", "number", "list", "sequence", "mapping")
+)
+_STRING_TYPES = frozenset(("string", "path"))
+_LIST_TYPES = frozenset(("list", "sequence"))
+_EMPTY_SCHEMA: Mapping[str, Any] = MappingProxyType({})
+
 
 class BasePlugin(ABC):
     """Stable interface implemented by all action plugins."""
@@ -24,9 +45,9 @@ class BasePlugin(ABC):
     category = ""
     required_params: tuple[str, ...] = ()
     optional_params: tuple[str, ...] = ()
-    parameter_schema: Dict[str, Dict[str, Any]] = {}
+    parameter_schema: Mapping[str, Mapping[str, Any]] = {}
     examples: tuple[str, ...] = ()
-    result_fields: Dict[str, str] = {}
+    result_fields: Mapping[str, str] = {}
     opens_remote_session = False
     supports_dry_run = True
     supports_check_mode = False
@@ -91,7 +112,7 @@ class BasePlugin(ABC):
 
     def _validate_parameter(self, name: str, value: Any) -> None:
         """Validate one parameter using this plugin's runtime schema."""
-        schema = dict(self.parameter_schema.get(name, {}) or {})
+        schema = self.parameter_schema.get(name) or _EMPTY_SCHEMA
         expected_types = schema.get("types", schema.get("type", "any"))
         if isinstance(expected_types, str):
             expected_types = (expected_types,)
@@ -121,12 +142,11 @@ class BasePlugin(ABC):
     def _validate_parameter_type(
         self, name: str, value: Any, expected_types: tuple[str, ...]
     ) -> None:
-        known_types = {"string", "path", "boolean", "integer", "number", "list", "sequence", "mapping"}
-        if not any(expected_type in known_types for expected_type in expected_types):
+        if _KNOWN_PARAMETER_TYPES.isdisjoint(expected_types):
             return
 
         for expected_type in expected_types:
-            if expected_type in {"string", "path"} and isinstance(value, str):
+            if expected_type in _STRING_TYPES and isinstance(value, str):
                 return
             if expected_type == "boolean" and isinstance(value, bool):
                 return
@@ -138,7 +158,7 @@ class BasePlugin(ABC):
                 return
             if expected_type == "number" and self._is_number(value):
                 return
-            if expected_type in {"list", "sequence"} and isinstance(value, list):
+            if expected_type in _LIST_TYPES and isinstance(value, list):
                 return
             if expected_type == "mapping" and isinstance(value, dict):
                 return
@@ -158,8 +178,6 @@ class BasePlugin(ABC):
 
     def dry_run(self, params: Dict[str, Any], context: ExecutionContext) -> PluginResult:
         """Default dry-run implementation with operator preview data."""
-        from automax.plugins.manual_preview import fallback_dry_run_data
-
         return PluginResult.success(
             changed=False,
             message=f"dry-run: {self.name}",
@@ -170,8 +188,6 @@ class BasePlugin(ABC):
         self, params: Dict[str, Any], context: ExecutionContext
     ) -> list[Dict[str, Any]]:
         """Return safe previews for plugins without a dedicated file diff renderer."""
-        from automax.plugins.manual_preview import fallback_diff_preview
-
         return fallback_diff_preview(self.name, params, context)
 
     def diff_preview_reason(self, params: Dict[str, Any], context: ExecutionContext) -> str:
@@ -182,8 +198,6 @@ class BasePlugin(ABC):
         self, params: Dict[str, Any], context: ExecutionContext
     ) -> list[str]:
         """Return copy/pasteable shell commands for manual recovery."""
-        from automax.plugins.manual_preview import fallback_manual_commands
-
         return fallback_manual_commands(self.name, params, context)
 
     def manual_commands_reason(self, params: Dict[str, Any], context: ExecutionContext) -> str:
@@ -218,8 +232,6 @@ class RenderedFileInstallMixin:
 
     def rendered_file_sudo(self, params: Dict[str, Any]) -> str:
         """Return sudo prefix for managed-file commands."""
-        from automax.plugins.remote_utils import sudo_prefix
-
         return sudo_prefix(params, default=self.rendered_file_default_sudo)
 
     def rendered_file_backup_enabled(self, params: Dict[str, Any]) -> bool:
@@ -244,8 +256,6 @@ class RenderedFileInstallMixin:
 
     def diff_preview(self, params: Dict[str, Any], context: ExecutionContext) -> list[Dict[str, Any]]:
         self.validate(params)
-        from difflib import unified_diff
-
         path = self.rendered_file_path(params)
         content = self.rendered_file_content(params)
         diff = "".join(
@@ -260,14 +270,6 @@ class RenderedFileInstallMixin:
 
     def manual_commands(self, params: Dict[str, Any], context: ExecutionContext) -> list[str]:
         self.validate(params)
-        from automax.plugins.remote_utils import (
-            cleanup_trap_command,
-            heredoc_to_file_expr,
-            quote,
-            shell_var_ref,
-            tempfile_command,
-        )
-
         content = self.rendered_file_content(params)
         path = self.rendered_file_path(params)
         mode = self.rendered_file_mode(params)
@@ -294,8 +296,6 @@ class RenderedFileInstallMixin:
         return commands
 
     def execute(self, params: Dict[str, Any], context: ExecutionContext) -> PluginResult:
-        from automax.plugins.remote_utils import CHANGE_MARKER, exec_remote, result_from_remote
-
         rc, out, err = exec_remote(context, " && ".join(self.manual_commands(params, context)))
         return result_from_remote(
             rc=rc,
@@ -359,8 +359,6 @@ class ReadOnlyCommandPlugin(BasePlugin):
 
     def _execute_read_only_commands(self, commands: list[str], context: ExecutionContext) -> tuple[int, str, str]:
         """Execute one or more read-only commands and aggregate output."""
-        from automax.plugins.remote_utils import exec_remote
-
         stdout_parts: list[str] = []
         stderr_parts: list[str] = []
         last_rc = 0
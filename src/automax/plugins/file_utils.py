@@ -7,8 +7,10 @@ Shared file transfer helpers for SSH-backed plugins.
 
 from __future__ import annotations
 
+import codecs
 from pathlib import Path
 import posixpath
+from typing import Iterable, Iterator
 import uuid
 
 from automax.core.models import ExecutionContext
@@ -21,20 +23,53 @@ def remote_dir(path: str) -> str:
     return parent or "."
 
 
+# Text larger than this many characters is encoded and written one slice at a
+# time, so a large rendered file is not held as str and bytes at once.
+_TEXT_CHUNK_CHARS = 1024 * 1024
+
+
 def upload_text_to_temp(context: ExecutionContext, content: str, *, encoding: str = "utf-8") -> str:
     """Upload text content to a remote temporary file and return the remote path."""
-    return upload_bytes_to_temp(context, content.encode(encoding), suffix=".txt")
+    if len(content) <= _TEXT_CHUNK_CHARS:
+        return upload_bytes_to_temp(context, content.encode(encoding), suffix=".txt")
+    return upload_bytes_to_temp(context, _encode_chunks(content, encoding), suffix=".txt")
+
 
+def _encode_chunks(content: str, encoding: str) -> Iterator[bytes]:
+    # An incremental encoder writes a BOM (utf-16, utf-8-sig) only once.
+    encoder = codecs.getincrementalencoder(encoding)()
+    for start in range(0, len(content), _TEXT_CHUNK_CHARS):
+        yield encoder.encode(content[start : start + _TEXT_CHUNK_CHARS])
+    tail = encoder.encode("", final=True)
+    if tail:
+        yield tail
 
-def upload_bytes_to_temp(context: ExecutionContext, content: bytes, *, suffix: str = "") -> str:
-    """Upload bytes to a remote temporary file and return the remote path."""
+
+def upload_bytes_to_temp(context: ExecutionContext, content: bytes | Iterable[bytes], *, suffix: str = "") -> str:
+    """Upload bytes, or an iterable of byte chunks, to a remote temporary file and return the remote path."""
     if context.ssh_client is None:
         raise RuntimeError("file upload requires an SSH session")
     remote_path = f"/tmp/automax-{context.run_id}-{uuid.uuid4().hex}{suffix}"
     sftp = context.ssh_client.open_sftp()
     try:
         with sftp.file(remote_path, "wb") as handle:
-            handle.write(content)
+            # Without pipelining every 32 KiB SFTP write waits for its ack;
+            # paramiko's own put() pipelines the same way and reports a
+            # failed write when the handle is closed.
+            handle.set_pipelined(True)
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                handle.write(content)
+            else:
+                for chunk in content:
+                    handle.write(chunk)
+    except BaseException:
+        # A chunk source can fail mid-way (for example an unencodable
+        # character); do not leave the partial temp file behind.
+        try:
+            sftp.remove(remote_path)
+        except Exception:
+            pass
+        raise
     finally:
         sftp.close()
     return remote_path
@@ -8,11 +8,9 @@ HTTP/API plugins executed from the controller.
 from __future__ import annotations
 
 import json as jsonlib
-import ssl
 import time
+from functools import lru_cache
 from typing import Any, Dict
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
 
 from automax.core.models import ExecutionContext, PluginResult
 from automax.plugins.base import BasePlugin, PluginValidationError
@@ -38,32 +36,90 @@ def _body(params: Dict[str, Any], headers: Dict[str, str]) -> bytes | None:
     return str(body).encode(str(params.get("encoding", "utf-8")))
 
 
-def _ssl_context(params: Dict[str, Any]):
-    if bool(params.get("validate_tls", True)):
-        return None
-    return ssl._create_unverified_context()  # noqa: S323 - explicit lab/operator override.
+_READ_CHUNK_SIZE = 64 * 1024
+# Content-Length comes from the server, so it only sizes the buffer up front
+# when it is small; larger or untrusted lengths let read() grow as data arrives.
+_PRESIZE_LIMIT = 8 * 1024 * 1024
+_BODYLESS_STATUSES = frozenset((204, 304))
+
+
+@lru_cache(maxsize=2)
+def _opener(validate_tls: bool) -> Any:
+    """Return a shared keep-alive opener per TLS mode.
+
+    The stock urlopen() path builds a fresh opener, loads the CA store and
+    opens a new connection per request. The shared opener keeps one SSL
+    context and reuses idle connections per host, so repeated requests
+    (notably http.wait polling) pay the TCP/TLS handshake once.
+    """
+    # urllib.request pulls in http.client and email; import it only when a
+    # request is actually sent so registry construction stays cheap.
+    import ssl
+    from urllib.request import build_opener
+
+    from automax.plugins.http_pool import KeepAliveHTTPHandler, KeepAliveHTTPSHandler
+
+    if validate_tls:
+        context = ssl.create_default_context()
+        context.set_alpn_protocols(["http/1.1"])
+    else:
+        context = ssl._create_unverified_context()  # noqa: S323 - explicit lab/operator override.
+    return build_opener(KeepAliveHTTPHandler(), KeepAliveHTTPSHandler(context=context))
+
+
+def _read_body(response: Any, encoding: str, method: str, status: int) -> str:
+    """Read a response body into one presized buffer and decode it once."""
+    length = response.headers.get("Content-Length") if response.headers else None
+    if (
+        method == "HEAD"
+        or status in _BODYLESS_STATUSES
+        or not length
+        or not length.isdigit()
+        or int(length) > _PRESIZE_LIMIT
+    ):
+        return response.read().decode(encoding, errors="replace")
+    buffer = bytearray(int(length))
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(buffer):
+        count = response.readinto(view[filled : filled + _READ_CHUNK_SIZE])
+        if not count:
+            break
+        filled += count
+    view.release()
+    if filled < len(buffer):
+        del buffer[filled:]
+    return buffer.decode(encoding, errors="replace")
 
 
 def _perform(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request; headers stay a message object until a result is built."""
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request
+
     headers = _headers(params)
     data = _body(params, headers)
     method = str(params.get("method", "GET" if data is None else "POST")).upper()
     request = Request(str(params["url"]), data=data, headers=headers, method=method)
     timeout = float(params.get("timeout", 30))
     try:
-        with urlopen(request, timeout=timeout, context=_ssl_context(params)) as response:
-            response_body = response.read().decode(str(params.get("encoding", "utf-8")), errors="replace")
+        with _opener(bool(params.get("validate_tls", True))).open(request, timeout=timeout) as response:
+            status = int(response.status)
+            response_body = _read_body(response, str(params.get("encoding", "utf-8")), method, status)
             return {
-                "status": int(response.status),
-                "headers": dict(response.headers.items()),
+                "status": status,
+                "headers": response.headers,
                 "body": response_body,
                 "error": "",
             }
     except HTTPError as exc:
-        response_body = exc.read().decode(str(params.get("encoding", "utf-8")), errors="replace")
+        try:
+            response_body = _read_body(exc, str(params.get("encoding", "utf-8")), method, int(exc.code))
+        finally:
+            exc.close()
         return {
             "status": int(exc.code),
-            "headers": dict(exc.headers.items()) if exc.headers else {},
+            "headers": exc.headers,
             "body": response_body,
             "error": str(exc),
         }
@@ -77,16 +133,27 @@ def _expected_statuses(params: Dict[str, Any], default: int = 200) -> set[int]:
     return {int(value) for value in values}
 
 
-def _check_response(params: Dict[str, Any], response: Dict[str, Any]) -> PluginResult:
+def _response_data(response: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(response)
+    headers = response.get("headers")
+    data["headers"] = dict(headers.items()) if headers else {}
+    return data
+
+
+def _response_matches(params: Dict[str, Any], response: Dict[str, Any]) -> tuple[list[int], bool, bool]:
     expected = _expected_statuses(params)
-    status = int(response["status"])
-    status_matches = status in expected
+    status_matches = int(response["status"]) in expected
     contains = params.get("contains")
     body_matches = contains is None or str(contains) in response["body"]
-    data = dict(response)
+    return sorted(expected), status_matches, body_matches
+
+
+def _check_response(params: Dict[str, Any], response: Dict[str, Any]) -> PluginResult:
+    expected, status_matches, body_matches = _response_matches(params, response)
+    data = _response_data(response)
     data.update(
         {
-            "expected_status": sorted(expected),
+            "expected_status": expected,
             "status_matches": status_matches,
             "body_matches": body_matches,
             "matches": status_matches and body_matches,
@@ -151,7 +218,7 @@ class HttpRequestPlugin(BasePlugin):
         response = _perform(params)
         if "expected_status" in params or "status" in params:
             return _assert_response(params, response)
-        return PluginResult.success(changed=False, stdout=response["body"], data=response)
+        return PluginResult.success(changed=False, stdout=response["body"], data=_response_data(response))
 
 
 class HttpAssertPlugin(HttpRequestPlugin):
@@ -178,18 +245,26 @@ class HttpWaitPlugin(HttpAssertPlugin):
         timeout = float(params.get("timeout", 60))
         interval = float(params.get("interval", 2))
         deadline = time.monotonic() + timeout
-        last_result: PluginResult | None = None
+        last_response: Dict[str, Any] | None = None
+        last_error = ""
         while True:
             try:
-                last_result = _check_response(params, _perform(params))
-                if last_result.data["matches"]:
-                    return last_result
+                last_response = _perform(params)
+                _expected, status_matches, body_matches = _response_matches(params, last_response)
+                if status_matches and body_matches:
+                    return _check_response(params, last_response)
             except PluginValidationError as exc:
-                last_result = PluginResult.failure(message=str(exc))
+                last_response, last_error = None, str(exc)
             if time.monotonic() >= deadline:
+                # Only the final poll is turned into result data.
+                last_result = (
+                    _check_response(params, last_response)
+                    if last_response is not None
+                    else PluginResult.failure(message=last_error)
+                )
                 return PluginResult.failure(
                     message="network.http.wait timed out",
-                    stdout=last_result.stdout if last_result else "",
-                    data=last_result.data if last_result else {},
+                    stdout=last_result.stdout,
+                    data=last_result.data,
                 )
             time.sleep(interval)
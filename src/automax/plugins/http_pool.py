@@ -0,0 +1,137 @@
+# Copyright (C) 2026 Marco Fortina
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Keep-alive urllib handlers for the controller-side HTTP plugins.
+
+urllib's stock handlers send ``Connection: close`` and open a new TCP/TLS
+connection for every request. These handlers keep idle connections per host so
+repeated requests to one endpoint (notably ``network.http.wait`` polling) pay
+the handshake once. Proxies, redirects and error processing stay with urllib.
+"""
+
+from __future__ import annotations
+
+import atexit
+import http.client
+import threading
+from typing import Any, Callable, Dict
+from urllib.error import URLError
+from urllib.request import HTTPHandler, HTTPSHandler
+
+_MAX_IDLE_PER_HOST = 4
+# Only methods that are safe to send twice are retried after a reused
+# connection turns out to be dead; the server may have processed a POST.
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+
+_idle: Dict[tuple, list[http.client.HTTPConnection]] = {}
+_idle_lock = threading.Lock()
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """Response that hands its connection back to the pool once closed."""
+
+    release: Callable[[bool], None] | None = None
+
+    def close(self) -> None:
+        # http.client drops fp only after the body was read to the end; a
+        # partially read body would corrupt the next response on the socket.
+        drained = self.fp is None
+        super().close()
+        release, self.release = self.release, None
+        if release is not None:
+            release(drained and not self.will_close)
+
+
+class KeepAliveHTTPHandler(HTTPHandler):
+    def http_open(self, req: Any) -> Any:
+        return _pooled_open(self, http.client.HTTPConnection, req)
+
+
+class KeepAliveHTTPSHandler(HTTPSHandler):
+    def __init__(self, *, context: Any) -> None:
+        super().__init__(context=context)
+        self._automax_context = context
+
+    def https_open(self, req: Any) -> Any:
+        return _pooled_open(self, http.client.HTTPSConnection, req, context=self._automax_context)
+
+
+@atexit.register
+def close_idle_connections() -> None:
+    """Close every idle pooled connection."""
+    with _idle_lock:
+        connections = [conn for pool in _idle.values() for conn in pool]
+        _idle.clear()
+    for conn in connections:
+        conn.close()
+
+
+def _pooled_open(handler: Any, http_class: Any, req: Any, **conn_args: Any) -> Any:
+    if req._tunnel_host:
+        # CONNECT tunnels through a proxy keep urllib's one-shot behavior.
+        return handler.do_open(http_class, req, **conn_args)
+    if not req.host:
+        raise URLError("no host given")
+
+    headers = dict(req.unredirected_hdrs)
+    headers.update({key: value for key, value in req.headers.items() if key not in headers})
+    headers = {name.title(): value for name, value in headers.items()}
+    # The TLS context is part of the key so verified and unverified requests
+    # never share a connection.
+    key = (http_class, req.host, conn_args.get("context"))
+    method = req.get_method()
+    retryable = method.upper() in _IDEMPOTENT_METHODS
+
+    for attempt in range(2):
+        conn, reused = _checkout(key, http_class, req, conn_args)
+        try:
+            conn.request(
+                method,
+                req.selector,
+                req.data,
+                headers,
+                encode_chunked=req.has_header("Transfer-encoding"),
+            )
+            response = conn.getresponse()
+        except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError) as exc:
+            conn.close()
+            # The server dropped an idle keep-alive connection; retry once on a fresh one.
+            if reused and retryable and attempt == 0:
+                continue
+            raise URLError(exc) from exc
+        except OSError as exc:
+            conn.close()
+            raise URLError(exc) from exc
+        except BaseException:
+            conn.close()
+            raise
+        break
+
+    response.url = req.get_full_url()
+    response.msg = response.reason
+    response.release = lambda reusable: _checkin(key, conn, reusable)
+    return response
+
+
+def _checkout(key: tuple, http_class: Any, req: Any, conn_args: Dict[str, Any]) -> tuple[Any, bool]:
+    with _idle_lock:
+        pool = _idle.get(key)
+        conn = pool.pop() if pool else None
+    if conn is not None and conn.sock is not None:
+        if isinstance(req.timeout, (int, float)):
+            conn.sock.settimeout(req.timeout)
+        return conn, True
+    conn = http_class(req.host, timeout=req.timeout, **conn_args)
+    conn.response_class = _PooledResponse
+    return conn, False
+
+
+def _checkin(key: tuple, conn: Any, reusable: bool) -> None:
+    if reusable and conn.sock is not None:
+        with _idle_lock:
+            pool = _idle.setdefault(key, [])
+            if len(pool) < _MAX_IDLE_PER_HOST:
+                pool.append(conn)
+                return
+    conn.close()
@@ -585,11 +585,10 @@ class SystemHostCheckPlugin(BasePlugin):
         with manager.connect(context.target) as client:
             stdin, stdout, stderr = client.exec_command("true", timeout=context.command_timeout or 10)
             rc = stdout.channel.recv_exit_status()
-            out = stdout.read().decode("utf-8", errors="replace")
-            err = stderr.read().decode("utf-8", errors="replace")
+            # Only the stream that is reported back gets decoded.
             if rc == 0:
-                return True, out
-            return False, err
+                return True, stdout.read().decode("utf-8", errors="replace")
+            return False, stderr.read().decode("utf-8", errors="replace")
 
     def execute(self, params: Dict[str, Any], context: ExecutionContext) -> PluginResult:
         self.validate(params)
@@ -24,6 +24,14 @@ class LocalCommandPlugin(BasePlugin):
     required_params = ("command",)
     parameter_schema = {"command": {"types": ("string", "list")}}
 
+    def validate(self, params: Dict[str, Any]) -> None:
+        super().validate(params)
+        if isinstance(params["command"], list):
+            if not params["command"]:
+                raise PluginValidationError("command.local.run list command cannot be empty")
+            if bool(params.get("shell", False)):
+                raise PluginValidationError("command.local.run cannot use a list command with shell: true")
+
     def manual_commands(
         self, params: Dict[str, Any], context: ExecutionContext
     ) -> list[str]:
@@ -54,7 +62,12 @@ class LocalCommandPlugin(BasePlugin):
             if not isinstance(env, dict):
                 raise PluginValidationError("command.local.run env must be a mapping")
             env = normalize_env_mapping(env)
-        shell = bool(params.get("shell", isinstance(command, str)))
+        if isinstance(command, list):
+            # argv lists are executed directly: no /bin/sh fork and no interpolation.
+            command = [str(item) for item in command]
+            shell = False
+        else:
+            shell = bool(params.get("shell", True))
         timeout = params.get("timeout", context.command_timeout)
 
         completed = subprocess.run(
@@ -5,16 +5,173 @@
 
 from __future__ import annotations
 
-import smtplib
-from email.message import EmailMessage
+import atexit
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+import threading
+from typing import Any, Callable, Dict
 
 from automax.core.models import ExecutionContext, PluginResult
+from automax.core.secrets import secret_fingerprint
 from automax.plugins.base import BasePlugin, PluginValidationError
 from automax.plugins.remote_utils import quote
 
 
+# Authenticated SMTP sessions reused across sends in one process; a batch of
+# notifications otherwise pays connect + TLS + AUTH for every message.
+_SMTP_POOL: Dict[tuple, Any] = {}
+_SMTP_POOL_LOCK = threading.Lock()
+
+
+def _smtp_key(params: Dict[str, Any]) -> tuple:
+    use_ssl = bool(params.get("ssl", False))
+    return (
+        str(params["smtp_host"]),
+        int(params.get("smtp_port", 465 if use_ssl else 587)),
+        use_ssl,
+        bool(params.get("starttls", True)) and not use_ssl,
+        str(params.get("username") or ""),
+        secret_fingerprint(str(params.get("password", ""))),
+    )
+
+
+def _send_pooled(params: Dict[str, Any], send: Callable[[Any], Any]) -> None:
+    key = _smtp_key(params)
+    smtp, reused = _checkout_smtp(key, params)
+    try:
+        try:
+            _send_tracked(smtp, send, retryable=reused)
+        except _SessionDropped:
+            _close_smtp(smtp)
+            smtp = _open_smtp(key, params)
+            send(smtp)
+    except BaseException:
+        _close_smtp(smtp)
+        raise
+    with _SMTP_POOL_LOCK:
+        spare = _SMTP_POOL.get(key)
+        _SMTP_POOL[key] = smtp
+    if spare is not None:
+        _close_smtp(spare)
+
+
+class _SessionDropped(Exception):
+    """A reused session disconnected before the server accepted MAIL FROM."""
+
+
+def _send_tracked(smtp: Any, send: Callable[[Any], Any], *, retryable: bool) -> None:
+    """Run ``send`` and tell a safe-to-resend disconnect from an unsafe one.
+
+    Until MAIL FROM is accepted nothing has been handed to the server. After
+    that a disconnect may follow a delivered DATA, so resending could deliver
+    the message twice and the error is raised as is.
+    """
+    import smtplib
+
+    started = False
+    mail = smtp.mail
+
+    def tracked_mail(*args: Any, **kwargs: Any) -> Any:
+        nonlocal started
+        reply = mail(*args, **kwargs)
+        started = True
+        return reply
+
+    smtp.mail = tracked_mail
+    try:
+        send(smtp)
+    except smtplib.SMTPServerDisconnected as exc:
+        if retryable and not started:
+            raise _SessionDropped() from exc
+        raise
+    finally:
+        del smtp.mail
+
+
+def _checkout_smtp(key: tuple, params: Dict[str, Any]) -> tuple[Any, bool]:
+    """Take a live pooled session out of the pool, or open a new one.
+
+    Sessions are removed while in use so concurrent sends never share one.
+    The flag tells whether the session was reused from the pool.
+    """
+    import smtplib
+
+    with _SMTP_POOL_LOCK:
+        smtp = _SMTP_POOL.pop(key, None)
+    if smtp is not None:
+        try:
+            if smtp.noop()[0] == 250:
+                return smtp, True
+        except (OSError, smtplib.SMTPException):
+            pass
+        _close_smtp(smtp)
+    return _open_smtp(key, params), False
+
+
+def _open_smtp(key: tuple, params: Dict[str, Any]) -> Any:
+    import smtplib
+
+    host, port, use_ssl, starttls, username, _ = key
+    client_cls = smtplib.SMTP_SSL if use_ssl else smtplib.SMTP
+    smtp = client_cls(host, port, timeout=float(params.get("timeout", 30)))
+    try:
+        if starttls:
+            smtp.starttls()
+        if username:
+            smtp.login(username, str(params.get("password", "")))
+    except BaseException:
+        _close_smtp(smtp)
+        raise
+    return smtp
+
+
+def _close_smtp(smtp: Any) -> None:
+    try:
+        smtp.quit()
+    except Exception:
+        smtp.close()
+
+
+@atexit.register
+def _close_smtp_pool() -> None:
+    with _SMTP_POOL_LOCK:
+        sessions = list(_SMTP_POOL.values())
+        _SMTP_POOL.clear()
+    for smtp in sessions:
+        _close_smtp(smtp)
+
+
+@lru_cache(maxsize=32)
+def _shared_message_bytes(sender: str, reply_to: str, subject: str, body: str) -> bytes:
+    """Serialize the recipient-independent headers and body of a plain notification.
+
+    Batches of notifications usually share sender, subject and body; building
+    and flattening the MIME message is the costly part, so it is done once.
+    """
+    from email import policy
+    from email.message import EmailMessage
+
+    msg = EmailMessage(policy=policy.SMTP)
+    msg["From"] = sender
+    if reply_to:
+        msg["Reply-To"] = reply_to
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg.as_bytes()
+
+
+def _recipient_header_bytes(to: list[str], cc: list[str]) -> bytes:
+    from email import policy
+    from email.message import EmailMessage
+
+    headers = EmailMessage(policy=policy.SMTP)
+    headers["To"] = ", ".join(to)
+    if cc:
+        headers["Cc"] = ", ".join(cc)
+    # Drop the blank line that terminates a header-only message.
+    return headers.as_bytes()[: -len(b"\r\n")]
+
+
 def _list(value: Any, name: str) -> list[str]:
     if isinstance(value, str):
         return [value]
@@ -50,32 +207,45 @@ class MailSendPlugin(BasePlugin):
         # smtplib has no useful CLI; expose a safe copy/paste placeholder without secrets.
         return [f"# Send mail from controller via SMTP {quote(params['smtp_host'])}:{port} to {quote(','.join(_list(params['to'], 'to')))} subject {quote(params['subject'])}; password is intentionally not rendered"]
 
-    def execute(self, params: Dict[str, Any], context: ExecutionContext) -> PluginResult:
-        self.validate(params)
+    @staticmethod
+    def _build_message(params: Dict[str, Any], to: list[str], cc: list[str], attachments: list[Any]) -> Any:
+        # The email package is only needed when mail is really sent.
+        from email.message import EmailMessage
+
         msg = EmailMessage()
         msg["From"] = str(params["from"])
-        msg["To"] = ", ".join(_list(params["to"], "to"))
-        if params.get("cc"):
-            msg["Cc"] = ", ".join(_list(params["cc"], "cc"))
+        msg["To"] = ", ".join(to)
+        if cc:
+            msg["Cc"] = ", ".join(cc)
         if params.get("reply_to"):
             msg["Reply-To"] = str(params["reply_to"])
         msg["Subject"] = str(params["subject"])
         msg.set_content(str(params.get("body", "")))
-        attachments = params.get("attachments", []) or []
-        if isinstance(attachments, str):
-            attachments = [attachments]
         for item in attachments:
             path = Path(str(item)).expanduser()
             msg.add_attachment(path.read_bytes(), maintype="application", subtype="octet-stream", filename=path.name)
-        recipients = _list(params["to"], "to") + (_list(params["cc"], "cc") if params.get("cc") else []) + (_list(params["bcc"], "bcc") if params.get("bcc") else [])
+        return msg
+
+    def execute(self, params: Dict[str, Any], context: ExecutionContext) -> PluginResult:
+        self.validate(params)
+        to = _list(params["to"], "to")
+        cc = _list(params["cc"], "cc") if params.get("cc") else []
+        recipients = to + cc + (_list(params["bcc"], "bcc") if params.get("bcc") else [])
+        attachments = params.get("attachments", []) or []
+        if isinstance(attachments, str):
+            attachments = [attachments]
+        sender = str(params["from"])
+        reply_to = str(params.get("reply_to") or "")
+        if not attachments and all(item.isascii() for item in (sender, reply_to, *recipients)):
+            from email.utils import getaddresses
+
+            payload = _recipient_header_bytes(to, cc) + _shared_message_bytes(
+                sender, reply_to, str(params["subject"]), str(params.get("body", ""))
+            )
+            envelope_sender = getaddresses([sender])[0][1]
+            _send_pooled(params, lambda smtp: smtp.sendmail(envelope_sender, recipients, payload))
+        else:
+            msg = self._build_message(params, to, cc, attachments)
+            _send_pooled(params, lambda smtp: smtp.send_message(msg, to_addrs=recipients))
         host = str(params["smtp_host"])
-        port = int(params.get("smtp_port", 465 if bool(params.get("ssl", False)) else 587))
-        timeout = float(params.get("timeout", 30))
-        client_cls = smtplib.SMTP_SSL if bool(params.get("ssl", False)) else smtplib.SMTP
-        with client_cls(host, port, timeout=timeout) as smtp:
-            if bool(params.get("starttls", True)) and not bool(params.get("ssl", False)):
-                smtp.starttls()
-            if params.get("username"):
-                smtp.login(str(params["username"]), str(params.get("password", "")))
-            smtp.send_message(msg, to_addrs=recipients)
         return PluginResult.success(changed=True, message="mail sent", data={"to": recipients, "smtp_host": host})
@@ -11,6 +11,7 @@ that every builtin plugin exposes a complete, deterministic contract.
 
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import Any
 
 from automax.plugins.base import BasePlugin
@@ -155,6 +156,7 @@ PARAMETERS: dict[str, dict[str, Any]] = {
     "delete": {"type": "boolean", "default": False, "description": "Delete extraneous destination files when supported."},
     "rsync_path": {"type": "path", "description": "Remote rsync executable path."},
     "ssh_options": {"type": "list", "description": "Extra ssh options used by rsync."},
+    "ssh_multiplex": {"type": "boolean", "default": False, "description": "Share one OpenSSH master connection across rsync runs to the same host. The master is a background ssh process that stays alive for 60s after the last rsync, also after automax exits."},
     "dry_run": {"type": "boolean", "default": False, "description": "Render or run without applying changes when supported."},
     "direction": {"type": "string", "default": "upload", "description": "Transfer direction such as upload, download or local."},
     "enable": {"type": "boolean", "default": False, "description": "Enable a service or timer after installing its unit."},
@@ -287,6 +289,7 @@ PARAMETERS: dict[str, dict[str, Any]] = {
     "success_rc": {"type": "integer", "default": 0, "min": 0, "description": "Return code considered successful."},
     "sudo": {"type": "boolean", "default": False, "description": "Run the remote operation through sudo -n when supported."},
     "system": {"type": "boolean", "default": False, "description": "Create a system user or group."},
+    "threads": {"type": "integer", "min": 1, "description": "Inflate gzip tar archives with pigz using this many threads when pigz is installed on the target; gzip is used otherwise."},
     "timeout": {"type": "number", "min": 0, "description": "Operation timeout in seconds."},
     "warning_days": {"type": "integer", "default": 30, "description": "Certificate expiry warning window in days."},
     "test_only": {"type": "boolean", "default": False, "description": "Validate without applying when supported."},
@@ -648,37 +651,55 @@ PLUGIN_EXAMPLES: dict[str, str] = {
 }
 
 
+# Builtin metadata depends only on the plugin class, while engines and CLI
+# commands each build a fresh registry; resolve it once per class. The cached
+# mappings are shared by every instance, so they are stored read-only.
+_RESOLVED_METADATA: dict[tuple[type, str], tuple[Any, ...]] = {}
+
+
 def apply_builtin_metadata(plugin: BasePlugin) -> BasePlugin:
     """Enrich a builtin plugin instance with complete public metadata."""
+    key = (type(plugin), plugin.name)
+    resolved = _RESOLVED_METADATA.get(key)
+    if resolved is None:
+        resolved = _RESOLVED_METADATA[key] = _resolve_builtin_metadata(plugin)
+    plugin.optional_params, plugin.parameter_schema, plugin.result_fields, plugin.examples = resolved
+    return plugin
+
+
+def _resolve_builtin_metadata(plugin: BasePlugin) -> tuple[Any, ...]:
+    optional_params = plugin.optional_params
     optional_override = OPTIONAL_PARAM_OVERRIDES.get(plugin.name)
     if optional_override:
-        plugin.optional_params = tuple(dict.fromkeys((*plugin.optional_params, *optional_override)))
+        optional_params = tuple(dict.fromkeys((*optional_params, *optional_override)))
 
     schema: dict[str, dict[str, Any]] = dict(getattr(plugin, "parameter_schema", {}) or {})
-    for name in (*plugin.required_params, *plugin.optional_params):
+    for name in (*plugin.required_params, *optional_params):
         if name not in PARAMETERS:
             raise KeyError(f"missing metadata definition for parameter '{name}' used by {plugin.name}")
         merged = dict(PARAMETERS[name])
         merged.update(schema.get(name, {}))
         schema[name] = merged
-    plugin.parameter_schema = schema
 
     result_fields = dict(DEFAULT_RESULT_FIELDS)
     result_fields.update(RESULT_FIELD_OVERRIDES.get(plugin.name, {}))
-    plugin.result_fields = result_fields
 
-    if not plugin.examples:
-        plugin.examples = (_build_example(plugin),)
-    return plugin
+    examples = plugin.examples or (_build_example(plugin, optional_params),)
+    return (
+        optional_params,
+        MappingProxyType({name: MappingProxyType(details) for name, details in schema.items()}),
+        MappingProxyType(result_fields),
+        examples,
+    )
 
 
-def _build_example(plugin: BasePlugin) -> str:
+def _build_example(plugin: BasePlugin, optional_params: tuple[str, ...]) -> str:
     configured = PLUGIN_EXAMPLES.get(plugin.name)
     if configured:
         return configured
     params = list(plugin.required_params)
     if not params:
-        params = [name for name in plugin.optional_params[:2] if name in SAMPLE_VALUES]
+        params = [name for name in optional_params[:2] if name in SAMPLE_VALUES]
     lines = [f"use: {plugin.name}"]
     if params:
         lines.append("with:")
@@ -11,8 +11,10 @@ points or external plugin paths without touching the engine.
 from __future__ import annotations
 
 import importlib.util
-import inspect
+import os
 from pathlib import Path
+import sys
+import threading
 from typing import Dict, Iterable
 
 from automax.plugins.base import BasePlugin
@@ -29,14 +31,28 @@ class PluginRegistry:
     def __init__(self):
         self._plugins: Dict[str, BasePlugin] = {}
         self._canonical_names: set[str] = set()
+        # Lookup indexes maintained by register() so listings never rescan plugins.
+        self._by_category: Dict[str, list[str]] = {}
+        self._sorted_names: list[str] | None = None
+        # External plugin files already executed; loading them again would
+        # re-register the same names.
+        self._loaded_files: set[Path] = set()
+        self._load_lock = threading.Lock()
 
     def register(self, plugin: BasePlugin) -> None:
         """Register one plugin instance under its canonical name and optional aliases."""
-        if plugin.name in self._plugins:
-            raise PluginRegistryError(f"duplicate plugin name: {plugin.name}")
-        self._plugins[plugin.name] = plugin
-        self._canonical_names.add(plugin.name)
+        # Interned keys let lookups with interned names (identifiers, literals)
+        # match on identity before falling back to string comparison.
+        name = sys.intern(plugin.name)
+        if name in self._plugins:
+            raise PluginRegistryError(f"duplicate plugin name: {name}")
+        self._plugins[name] = plugin
+        self._canonical_names.add(name)
+        category = sys.intern(plugin.category or name.split(".", 1)[0])
+        self._by_category.setdefault(category, []).append(name)
+        self._sorted_names = None
         for alias in plugin.aliases:
+            alias = sys.intern(alias)
             if alias in self._plugins:
                 raise PluginRegistryError(f"duplicate plugin alias: {alias}")
             self._plugins[alias] = plugin
@@ -48,11 +64,22 @@ class PluginRegistry:
         except KeyError as exc:
             raise PluginRegistryError(f"unknown plugin: {name}") from exc
 
-    def names(self, *, include_aliases: bool = False) -> list[str]:
-        """List canonical plugin names, optionally including aliases."""
+    def names(self, *, include_aliases: bool = False, category: str | None = None) -> list[str]:
+        """List canonical plugin names, optionally including aliases or one category."""
+        if category is not None:
+            names = self._by_category.get(category, [])
+            if include_aliases:
+                names = [*names, *(alias for name in names for alias in self._plugins[name].aliases)]
+            return sorted(names)
         if include_aliases:
             return sorted(self._plugins)
-        return sorted(self._canonical_names)
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._canonical_names)
+        return list(self._sorted_names)
+
+    def categories(self) -> list[str]:
+        """List plugin categories that have at least one registered plugin."""
+        return sorted(self._by_category)
 
     def describe(self, name: str) -> dict[str, object]:
         """Return user-facing metadata for one plugin."""
@@ -63,17 +90,36 @@ class PluginRegistry:
         return [self.get(name).metadata() for name in self.names()]
 
     def load_from_paths(self, paths: Iterable[str]) -> None:
-        """Load plugin classes from external .py files or directories."""
+        """Load plugin classes from external .py files or directories.
+
+        Files that were already loaded into this registry are skipped, so the
+        same paths can be passed again (for example on resume) from any thread.
+        """
         for raw_path in paths:
             path = Path(raw_path).expanduser().resolve()
             if path.is_dir():
-                for plugin_file in sorted(path.glob("*.py")):
-                    self._load_module_file(plugin_file)
+                with os.scandir(path) as entries:
+                    plugin_files = sorted(
+                        entry.name
+                        for entry in entries
+                        if entry.name.endswith(".py") and entry.is_file()
+                    )
+                for file_name in plugin_files:
+                    self._load_module_file_once(path / file_name)
             elif path.is_file():
-                self._load_module_file(path)
+                self._load_module_file_once(path)
             else:
                 raise PluginRegistryError(f"plugin path not found: {path}")
 
+    def _load_module_file_once(self, path: Path) -> None:
+        if path in self._loaded_files:
+            return
+        with self._load_lock:
+            if path in self._loaded_files:
+                return
+            self._load_module_file(path)
+            self._loaded_files.add(path)
+
     def _load_module_file(self, path: Path) -> None:
         module_name = f"automax_external_plugin_{path.stem}"
         spec = importlib.util.spec_from_file_location(module_name, path)
@@ -83,8 +129,10 @@ class PluginRegistry:
         spec.loader.exec_module(module)
 
         found = False
-        for _, obj in inspect.getmembers(module, inspect.isclass):
-            if issubclass(obj, BasePlugin) and obj is not BasePlugin:
+        # A direct namespace walk avoids inspect.getmembers(), which resolves
+        # every attribute through getattr() before filtering.
+        for _, obj in sorted(vars(module).items()):
+            if isinstance(obj, type) and issubclass(obj, BasePlugin) and obj is not BasePlugin:
                 self.register(obj())
                 found = True
         if not found:
@@ -11,7 +11,7 @@ from typing import Any, Dict
 
 from automax.core.models import ExecutionContext, PluginResult
 from automax.plugins.base import BasePlugin
-from automax.plugins.remote_utils import apply_cwd, prepare_sudo_password_command
+from automax.plugins.remote_utils import apply_cwd, prepare_sudo_password_command, read_remote_output
 
 
 class RemoteCommandPlugin(BasePlugin):
@@ -53,9 +53,9 @@ class RemoteCommandPlugin(BasePlugin):
         if wrote_stdin:
             stdin.channel.shutdown_write()
 
-        rc = stdout.channel.recv_exit_status()
-        out = stdout.read().decode(params.get("encoding", "utf-8"), errors="replace")
-        err = stderr.read().decode(params.get("encoding", "utf-8"), errors="replace")
+        rc, raw_out, raw_err = read_remote_output(stdout, stderr)
+        out = raw_out.decode(params.get("encoding", "utf-8"), errors="replace")
+        err = raw_err.decode(params.get("encoding", "utf-8"), errors="replace")
         ok = rc == int(params.get("success_rc", 0))
         if not ok:
             return PluginResult.failure(
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import re
 import shlex
+import threading
 from typing import Any, Mapping, Tuple
 
 from automax.core.models import ExecutionContext, PluginResult
@@ -174,6 +175,30 @@ sudo() {{
     return wrapped, f"{sudo_password}\n"
 
 
+def read_remote_output(stdout: Any, stderr: Any) -> Tuple[int, bytes, bytes]:
+    """Drain stdout and stderr while the command runs, then return its exit status.
+
+    Waiting for the exit status before reading lets a verbose command fill the
+    SSH channel window and stall before it can exit, so stderr is drained on a
+    helper thread while stdout is read to EOF.
+    """
+    captured: dict[str, Any] = {}
+
+    def drain_stderr() -> None:
+        try:
+            captured["stderr"] = stderr.read()
+        except BaseException as exc:  # re-raised on the calling thread
+            captured["error"] = exc
+
+    reader = threading.Thread(target=drain_stderr, name="automax-ssh-stderr", daemon=True)
+    reader.start()
+    out = stdout.read()
+    reader.join()
+    if "error" in captured:
+        raise captured["error"]
+    return stdout.channel.recv_exit_status(), out, captured["stderr"]
+
+
 def exec_remote(
     context: ExecutionContext,
     command: str,
@@ -194,10 +219,8 @@ def exec_remote(
     if sudo_stdin:
         stdin.write(sudo_stdin)
         stdin.channel.shutdown_write()
-    rc = stdout.channel.recv_exit_status()
-    out = stdout.read().decode(encoding, errors="replace")
-    err = stderr.read().decode(encoding, errors="replace")
-    return rc, out, err
+    rc, out, err = read_remote_output(stdout, stderr)
+    return rc, out.decode(encoding, errors="replace"), err.decode(encoding, errors="replace")
 
 
 def result_from_remote(
@@ -11,6 +11,7 @@ from pathlib import Path, PurePosixPath
 import subprocess
 import hashlib
 import os
+import shutil
 import stat
 from typing import Any, Dict
 
@@ -19,6 +20,11 @@ from automax.plugins.base import BasePlugin, PluginValidationError
 from automax.plugins.file_utils import install_uploaded_file
 from automax.plugins.remote_utils import exec_remote, quote
 
+# OpenSSH connection sharing: the first rsync to a host opens a master
+# connection that later rsync runs reuse, skipping the handshake. The master
+# is a background ssh process that outlives automax for ControlPersist.
+_SSH_MULTIPLEX_OPTIONS = "-o ControlMaster=auto -o ControlPath=~/.ssh/automax-cm-%C -o ControlPersist=60s"
+
 
 def _is_templated_path(value: str) -> bool:
     """Return true when validation must wait until job rendering."""
@@ -42,11 +48,31 @@ def _mkdir_remote(context: ExecutionContext, path: str) -> None:
     exec_remote(context, f"mkdir -p {quote(path)}")
 
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
 def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
+    # Read unbuffered into one reused buffer: no per-chunk bytes object and
+    # no extra copy through the BufferedReader, as hashlib.file_digest does.
+    with path.open("rb", buffering=0) as handle:
+        if hasattr(os, "posix_fadvise"):
+            # Widen read-ahead for the whole-file scan. The pages are kept
+            # (no DONTNEED) because an upload reads the same file right after.
+            try:
+                os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        file_digest = getattr(hashlib, "file_digest", None)
+        if file_digest is not None:
+            return file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        buffer = bytearray(_HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = handle.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
     return digest.hexdigest()
 
 
@@ -84,46 +110,81 @@ def _remote_apply_attrs(context: ExecutionContext, path: str, params: Dict[str,
         exec_remote(context, " && ".join(commands))
 
 
-def _upload_file(context: ExecutionContext, sftp, src: Path, dest: str, *, preserve_times: bool = False) -> None:
-    _mkdir_remote(context, _remote_parent(dest))
-    sftp.put(str(src), dest)
+def _sftp_mkdir(sftp, path: str) -> None:
+    try:
+        sftp.mkdir(path)
+    except OSError:
+        # An existing directory is fine (re-upload); anything else is not, and
+        # the mkdir error (e.g. permission denied) is the one worth reporting.
+        try:
+            is_dir = stat.S_ISDIR(sftp.stat(path).st_mode)
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            raise
+
+
+def _upload_file(
+    context: ExecutionContext, sftp, src: Path, dest: str, *, preserve_times: bool = False, parent_ready: bool = False
+) -> None:
+    if not parent_ready:
+        _mkdir_remote(context, _remote_parent(dest))
+    # confirm=True re-stats the remote file to compare sizes: one more round
+    # trip per file for a write the server already acknowledged on close.
+    sftp.put(str(src), dest, confirm=False)
     if preserve_times:
         stat_result = src.stat()
         sftp.utime(dest, (stat_result.st_atime, stat_result.st_mtime))
 
 
-def _upload_dir(context: ExecutionContext, sftp, src: Path, dest: str, *, preserve_times: bool = False) -> None:
-    _mkdir_remote(context, dest)
+def _upload_dir(
+    context: ExecutionContext, sftp, src: Path, dest: str, *, preserve_times: bool = False, parent_ready: bool = False
+) -> None:
+    # Only the top-level destination needs mkdir -p through a remote shell;
+    # entries below it go over the open SFTP session, which saves one exec
+    # channel per file on trees with many entries.
+    if parent_ready:
+        _sftp_mkdir(sftp, dest)
+    else:
+        _mkdir_remote(context, dest)
     for item in src.iterdir():
         remote_item = str(PurePosixPath(dest) / item.name)
         if item.is_dir():
-            _upload_dir(context, sftp, item, remote_item, preserve_times=preserve_times)
+            _upload_dir(context, sftp, item, remote_item, preserve_times=preserve_times, parent_ready=True)
         else:
-            _upload_file(context, sftp, item, remote_item, preserve_times=preserve_times)
+            _upload_file(context, sftp, item, remote_item, preserve_times=preserve_times, parent_ready=True)
     if preserve_times:
         stat_result = src.stat()
         sftp.utime(dest, (stat_result.st_atime, stat_result.st_mtime))
 
 
-def _download_file(sftp, src: str, dest: Path, *, preserve_times: bool = False) -> None:
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    attrs = sftp.stat(src)
+def _download_file(
+    sftp, src: str, dest: Path, *, preserve_times: bool = False, attrs: Any = None, parent_ready: bool = False
+) -> None:
+    # Callers pass the attributes they already hold (the top-level stat or a
+    # listdir_attr entry); each extra stat is a round trip to the target.
+    if not parent_ready:
+        dest.parent.mkdir(parents=True, exist_ok=True)
     sftp.get(src, str(dest))
     if preserve_times:
+        if attrs is None:
+            attrs = sftp.stat(src)
         os.utime(dest, (attrs.st_atime, attrs.st_mtime))
 
 
-def _download_dir(sftp, src: str, dest: Path, *, preserve_times: bool = False) -> None:
+def _download_dir(sftp, src: str, dest: Path, *, preserve_times: bool = False, attrs: Any = None) -> None:
     dest.mkdir(parents=True, exist_ok=True)
-    attrs = sftp.stat(src)
     for entry in sftp.listdir_attr(src):
         remote_item = str(PurePosixPath(src) / entry.filename)
         local_item = dest / entry.filename
         if stat.S_ISDIR(entry.st_mode):
-            _download_dir(sftp, remote_item, local_item, preserve_times=preserve_times)
+            _download_dir(sftp, remote_item, local_item, preserve_times=preserve_times, attrs=entry)
         else:
-            _download_file(sftp, remote_item, local_item, preserve_times=preserve_times)
+            # _download_dir created ``dest`` above; skip the per-file mkdir.
+            _download_file(sftp, remote_item, local_item, preserve_times=preserve_times, attrs=entry, parent_ready=True)
     if preserve_times:
+        if attrs is None:
+            attrs = sftp.stat(src)
         os.utime(dest, (attrs.st_atime, attrs.st_mtime))
 
 
@@ -155,14 +216,17 @@ class TransferUploadPlugin(BasePlugin):
         self.validate(params)
         src = Path(str(params["src"])).expanduser()
         dest = str(params["dest"])
+        is_dir = src.is_dir()
         if params.get("checksum"):
             _assert_checksum(src, str(params["checksum"]))
+        # is_file() rather than "not is_dir": a missing source must fail locally,
+        # not after it has been staged for a remote sudo install.
         if src.is_file() and bool(params.get("sudo", False)):
             _remote_safe_prepare(context, dest, params)
             remote_tmp = f"/tmp/automax-upload-{context.run_id}-{src.name}"
             sftp = _sftp(context)
             try:
-                sftp.put(str(src), remote_tmp)
+                sftp.put(str(src), remote_tmp, confirm=False)
                 if bool(params.get("preserve_times", False)):
                     stat_result = src.stat()
                     sftp.utime(remote_tmp, (stat_result.st_atime, stat_result.st_mtime))
@@ -185,7 +249,7 @@ class TransferUploadPlugin(BasePlugin):
         sftp = _sftp(context)
         try:
             _remote_safe_prepare(context, dest, params)
-            if src.is_dir():
+            if is_dir:
                 _upload_dir(context, sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)))
             else:
                 _upload_file(context, sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)))
@@ -193,7 +257,7 @@ class TransferUploadPlugin(BasePlugin):
             sftp.close()
         if params.get("checksum"):
             exec_remote(context, f"sha256sum {quote(dest)} | awk '{{print $1}}' | grep -Fx -- {quote(params['checksum'])}")
-        _remote_apply_attrs(context, dest, params, recursive=src.is_dir())
+        _remote_apply_attrs(context, dest, params, recursive=is_dir)
         return PluginResult.success(changed=True, data={"src": str(src), "dest": dest})
 
 
@@ -214,12 +278,13 @@ class TransferDownloadPlugin(BasePlugin):
             if bool(params.get("backup_existing", False)):
                 backup_dest = dest.with_name(dest.name + str(params.get("backup_suffix", ".bak")))
                 if dest.is_dir():
-                    import shutil
                     if backup_dest.exists():
                         shutil.rmtree(backup_dest)
                     shutil.copytree(dest, backup_dest)
                 else:
-                    backup_dest.write_bytes(dest.read_bytes())
+                    # Streamed by the kernel where possible instead of holding
+                    # the whole file in memory; metadata is kept like copytree.
+                    shutil.copy2(dest, backup_dest)
             if not bool(params.get("overwrite", True)):
                 raise PluginValidationError(f"destination already exists: {dest}")
         sftp = _sftp(context)
@@ -228,9 +293,9 @@ class TransferDownloadPlugin(BasePlugin):
             if stat.S_ISDIR(attrs.st_mode):
                 if not bool(params.get("recursive", False)):
                     raise PluginValidationError("data.transfer.download requires recursive=true for directories")
-                _download_dir(sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)))
+                _download_dir(sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)), attrs=attrs)
             else:
-                _download_file(sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)))
+                _download_file(sftp, src, dest, preserve_times=bool(params.get("preserve_times", False)), attrs=attrs)
         finally:
             sftp.close()
         if params.get("checksum"):
@@ -281,17 +346,19 @@ class TransferRsyncPlugin(BasePlugin):
             parts.append("--dry-run")
         if params.get("rsync_path"):
             parts.extend(["--rsync-path", str(params["rsync_path"])])
+        direction = str(params.get("direction", "upload"))
         ssh_options = params.get("ssh_options")
+        if isinstance(ssh_options, list):
+            ssh_options = " ".join(str(item) for item in ssh_options)
+        if bool(params.get("ssh_multiplex", False)) and direction != "local":
+            ssh_options = f"{_SSH_MULTIPLEX_OPTIONS} {ssh_options}" if ssh_options else _SSH_MULTIPLEX_OPTIONS
         if ssh_options:
-            if isinstance(ssh_options, list):
-                ssh_options = " ".join(str(item) for item in ssh_options)
             parts.extend(["-e", f"ssh {ssh_options}"])
         excludes = params.get("excludes") or []
         if isinstance(excludes, str):
             excludes = [excludes]
         for pattern in excludes:
             parts.extend(["--exclude", str(pattern)])
-        direction = str(params.get("direction", "upload"))
         src = str(params["src"])
         dest = str(params["dest"])
         if direction == "upload":
@@ -313,11 +380,13 @@ class TransferRsyncPlugin(BasePlugin):
         completed = subprocess.run(command, text=True, capture_output=True, timeout=float(params.get("timeout", 0)) or None, check=False)
         if completed.returncode != 0:
             return PluginResult.failure(rc=completed.returncode, stdout=completed.stdout, stderr=completed.stderr, message="data.transfer.rsync failed")
-        changed = bool(completed.stdout.strip()) and not (bool(params.get("dry_run", False)) or context.dry_run)
+        # isspace() answers "any output?" without copying a large itemized listing.
+        changed = bool(completed.stdout) and not completed.stdout.isspace() and not (bool(params.get("dry_run", False)) or context.dry_run)
         return PluginResult.success(changed=changed, rc=completed.returncode, stdout=completed.stdout, stderr=completed.stderr, data={"command": command})
 
 # Extended rsync operator controls.
 
+
 def _rsync_parts_extended(self: TransferRsyncPlugin, params: Dict[str, Any], context: ExecutionContext) -> list[str]:
     parts = TransferRsyncPlugin._command_parts(self, params, context)
     insert_at = 1
@@ -338,7 +407,7 @@ def _rsync_parts_extended(self: TransferRsyncPlugin, params: Dict[str, Any], con
 class ExtendedTransferRsyncPlugin(TransferRsyncPlugin):
     """data.transfer.rsync with extended operator controls."""
 
-    optional_params = ("direction", "archive", "compress", "delete", "checksum", "dry_run", "excludes", "ssh_options", "rsync_path", "timeout", "partial", "bwlimit", "numeric_ids", "itemize_changes", "stats")
+    optional_params = ("direction", "archive", "compress", "delete", "checksum", "dry_run", "excludes", "ssh_options", "rsync_path", "timeout", "partial", "bwlimit", "numeric_ids", "itemize_changes", "stats", "ssh_multiplex")
 
     def _command_parts(self, params: Dict[str, Any], context: ExecutionContext) -> list[str]:
         return _rsync_parts_extended(self, params, context)
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
@@ -11,13 +12,13 @@ import subprocess
 import sys
 
 import pytest
-import yaml
 from click.testing import CliRunner
 
 from automax.cli.cli import cli
 from automax.core.engine import AutomaxEngine
 from automax.core.models import ExecutionContext, Target
 from automax.core.state import StateStore
+from automax.core.yaml_loader import safe_load
 
 
 def write(path: Path, content: str) -> Path:
@@ -26,6 +27,24 @@ def write(path: Path, content: str) -> Path:
     return path
 
 
+@lru_cache(maxsize=None)
+def _repo_text(path: Path) -> str:
+    # Several namespace tests scan the same docs and runbooks; read each once.
+    return path.read_text(encoding="utf-8")
+
+
+def _legacy_name_offenders(paths: list[Path], old_names: list[str]) -> list[str]:
+    # One alternation per test instead of one regex per name and file; longer
+    # names first so a name is never shadowed by one of its prefixes.
+    alternatives = "|".join(re.escape(name) for name in sorted(set(old_names), key=len, reverse=True))
+    pattern = re.compile(r"(?<![A-Za-z0-9_.])(?:" + alternatives + r")(?![A-Za-z0-9_.])")
+    offenders = []
+    for path in paths:
+        found = set(pattern.findall(_repo_text(path)))
+        offenders.extend(f"{path}:{old_name}" for old_name in old_names if old_name in found)
+    return offenders
+
+
 
 def test_python_m_cli_entrypoint_does_not_emit_runpy_warning():
     env = os.environ.copy()
@@ -147,7 +166,7 @@ secrets:
         )
 
 
-def test_substep_targets_are_respected_in_plan(tmp_path: Path):
+def test_substep_targets_are_respected_in_plan(tmp_path: Path, monkeypatch):
     job = write(
         tmp_path / "job.yaml",
         """
@@ -186,6 +205,7 @@ servers:
 """,
     )
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(cli, ["plan", "--job", str(job), "--inventory", str(inventory)])
 
     assert result.exit_code == 0, result.output
@@ -730,7 +750,7 @@ def test_run_all_checks_supports_optional_keep_going_summary():
 def test_plugin_smoke_runbooks_keep_file_modes_as_strings():
     offenders = []
     for runbook_path in sorted(Path("examples/runbooks/runbooks").glob("*.check.yaml")):
-        data = yaml.safe_load(runbook_path.read_text(encoding="utf-8"))
+        data = safe_load(runbook_path.read_text(encoding="utf-8"))
         for task in data.get("tasks", []):
             for step in task.get("steps", []):
                 for substep in step.get("substeps", []):
@@ -746,7 +766,7 @@ def test_plugin_smoke_runbooks_keep_file_modes_as_strings():
 
 def test_plugin_smoke_runbooks_match_archive_decompress_parameters():
     runbook_path = Path("examples/runbooks/runbooks/03-data-archive.check.yaml")
-    data = yaml.safe_load(runbook_path.read_text(encoding="utf-8"))
+    data = safe_load(runbook_path.read_text(encoding="utf-8"))
     offenders = []
     for task in data.get("tasks", []):
         for step in task.get("steps", []):
@@ -769,7 +789,7 @@ def test_plugin_smoke_runbooks_match_auditd_search_user_schema():
     plugin = build_builtin_registry().get("security.audit.search")
     plugin.validate({"key": "automax", "user": "deploy", "start": "recent", "end": "now"})
 
-    runbook = yaml.safe_load(Path("examples/runbooks/runbooks/05-auditd.check.yaml").read_text(encoding="utf-8"))
+    runbook = safe_load(Path("examples/runbooks/runbooks/05-auditd.check.yaml").read_text(encoding="utf-8"))
     search_substeps = [
         substep
         for task in runbook.get("tasks", [])
@@ -785,7 +805,7 @@ def test_plugin_smoke_runbooks_use_valid_node_ids():
     node_id_pattern = re.compile(r"^[A-Za-z0-9_.-]+$")
     offenders = []
     for runbook_path in sorted(Path("examples/runbooks/runbooks").glob("*.check.yaml")):
-        data = yaml.safe_load(runbook_path.read_text(encoding="utf-8"))
+        data = safe_load(runbook_path.read_text(encoding="utf-8"))
         for task in data.get("tasks", []):
             task_id = task.get("id")
             if not isinstance(task_id, str) or not node_id_pattern.match(task_id):
@@ -808,7 +828,7 @@ def test_plugin_smoke_runbooks_validate_against_builtin_schemas():
     registry = build_builtin_registry()
     failures = []
     for runbook_path in sorted(Path("examples/runbooks/runbooks").glob("*.check.yaml")):
-        data = yaml.safe_load(runbook_path.read_text(encoding="utf-8"))
+        data = safe_load(runbook_path.read_text(encoding="utf-8"))
         for task in data.get("tasks", []):
             for step in task.get("steps", []):
                 for substep in step.get("substeps", []):
@@ -1024,14 +1044,7 @@ def test_security_namespace_replaces_legacy_security_plugin_names():
         Path("examples/runbooks/RUNBOOK_INDEX.md"),
         *Path("examples/runbooks/runbooks").glob("*.check.yaml"),
     ]
-    offenders = []
-    for path in searched:
-        text = path.read_text(encoding="utf-8")
-        for old_name in old_names:
-            pattern = re.compile(r"(?<![A-Za-z0-9_.])" + re.escape(old_name) + r"(?![A-Za-z0-9_.])")
-            if pattern.search(text):
-                offenders.append(f"{path}:{old_name}")
-    assert offenders == []
+    assert _legacy_name_offenders(searched, old_names) == []
 
 
 
@@ -1094,14 +1107,7 @@ def test_identity_namespace_replaces_legacy_user_group_plugin_names():
         Path("examples/runbooks/RUNBOOK_INDEX.md"),
         *Path("examples/runbooks/runbooks").glob("*.check.yaml"),
     ]
-    offenders = []
-    for path in searched:
-        text = path.read_text(encoding="utf-8")
-        for old_name in old_names:
-            pattern = re.compile(r"(?<![A-Za-z0-9_.])" + re.escape(old_name) + r"(?![A-Za-z0-9_.])")
-            if pattern.search(text):
-                offenders.append(f"{path}:{old_name}")
-    assert offenders == []
+    assert _legacy_name_offenders(searched, old_names) == []
 
 def test_storage_namespace_replaces_legacy_storage_plugin_names():
     from automax.plugins.registry import build_builtin_registry
@@ -1196,14 +1202,7 @@ def test_storage_namespace_replaces_legacy_storage_plugin_names():
         Path("examples/runbooks/RUNBOOK_INDEX.md"),
         *Path("examples/runbooks/runbooks").glob("*.check.yaml"),
     ]
-    offenders = []
-    for path in searched:
-        text = path.read_text(encoding="utf-8")
-        for old_name in old_names:
-            pattern = re.compile(r"(?<![A-Za-z0-9_.])" + re.escape(old_name) + r"(?![A-Za-z0-9_.])")
-            if pattern.search(text):
-                offenders.append(f"{path}:{old_name}")
-    assert offenders == []
+    assert _legacy_name_offenders(searched, old_names) == []
 
 
 
@@ -1315,14 +1314,7 @@ def test_os_namespace_replaces_legacy_operating_system_plugin_names():
         *Path("examples/runbooks/runbooks").glob("*.check.yaml"),
     ]
     doc_old_names = [name for name in old_names if name != "login.defs"]
-    offenders = []
-    for path in searched:
-        text = path.read_text(encoding="utf-8")
-        for old_name in doc_old_names:
-            pattern = re.compile(r"(?<![A-Za-z0-9_.])" + re.escape(old_name) + r"(?![A-Za-z0-9_.])")
-            if pattern.search(text):
-                offenders.append(f"{path}:{old_name}")
-    assert offenders == []
+    assert _legacy_name_offenders(searched, doc_old_names) == []
 
 def test_health_namespace_is_removed_from_public_documentation_and_runbooks():
     from automax.plugins.registry import build_builtin_registry
@@ -1398,14 +1390,7 @@ def test_flat_network_resource_namespaces_are_not_public_plugin_surface():
         Path("examples/runbooks/RUNBOOK_INDEX.md"),
         *Path("examples/runbooks/runbooks").glob("*.check.yaml"),
     ]
-    offenders = []
-    for path in searched:
-        text = path.read_text(encoding="utf-8")
-        for old_name in old_names:
-            pattern = re.compile(r"(?<![A-Za-z0-9_.])" + re.escape(old_name) + r"(?![A-Za-z0-9_.])")
-            if pattern.search(text):
-                offenders.append(f"{path}:{old_name}")
-    assert offenders == []
+    assert _legacy_name_offenders(searched, old_names) == []
 
 def test_top_level_firewall_namespaces_are_not_public_plugin_surface():
     from automax.plugins.registry import build_builtin_registry
@@ -1465,7 +1450,7 @@ def test_top_level_firewall_namespaces_are_not_public_plugin_surface():
     ]
     offenders = []
     for path in searched:
-        text = path.read_text(encoding="utf-8")
+        text = _repo_text(path)
         if old_public_reference.search(text):
             offenders.append(str(path))
     assert offenders == []
@@ -1548,3 +1533,26 @@ def test_docs_show_sudo_password_env_for_runs_and_capability_installs():
     assert "automax run --job job.yaml --inventory inventory.yaml --sudo-password-env AUTOMAX_SUDO_PASSWORD" in docs
     assert "automax capabilities install --job job.yaml --inventory inventory.yaml --sudo-password-env AUTOMAX_SUDO_PASSWORD" in docs
     assert "automax capabilities install --job job.yaml --inventory inventory.yaml --sudo-password-env AUTOMAX_SUDO_PASSWORD --verbose" in docs
+
+
+def test_cli_and_builtin_registry_do_not_import_optional_heavy_modules():
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path("src").resolve())
+    script = (
+        "import sys\n"
+        "import automax.cli.cli\n"
+        "from automax.plugins.registry import build_builtin_registry\n"
+        "build_builtin_registry()\n"
+        "print(sorted(m for m in ('jinja2', 'paramiko', 'smtplib', 'urllib.request') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path.cwd(),
+        env=env,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
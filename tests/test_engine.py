@@ -125,7 +125,7 @@ servers:
     assert list(state_dir.glob("*/state.sqlite"))
 
 
-def test_plan_prints_three_level_checkpoint_ids(tmp_path: Path):
+def test_plan_prints_three_level_checkpoint_ids(tmp_path: Path, monkeypatch):
     job = write(
         tmp_path / "job.yaml",
         """
@@ -157,6 +157,7 @@ servers:
 """,
     )
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(
         cli,
         ["plan", "--job", str(job), "--inventory", str(inventory)],
@@ -182,7 +183,7 @@ def test_state_store_lists_runs(tmp_path: Path):
     assert [run["run_id"] for run in runs] == ["run-1"]
 
 
-def test_tags_and_skip_tags_filter_plan(tmp_path: Path):
+def test_tags_and_skip_tags_filter_plan(tmp_path: Path, monkeypatch):
     job = write(
         tmp_path / "job.yaml",
         """
@@ -210,6 +211,7 @@ tasks:
     )
     inventory = write(tmp_path / "inventory.yaml", "servers:\n  controller:\n    host: 127.0.0.1\n")
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(
         cli,
         [
@@ -887,6 +889,98 @@ tasks:
 
 
 
+def test_templating_reuses_compiled_templates_across_contexts():
+    from automax.core import templating
+
+    source = "{{ base }}/releases/{{ version }}-cache-test"
+    before = templating._compile_text.cache_info().hits
+
+    assert templating.render_value(source, {"base": "/srv", "version": "1"}) == "/srv/releases/1-cache-test"
+    assert templating.render_value(source, {"base": "/opt", "version": "2"}) == "/opt/releases/2-cache-test"
+    assert templating._compile_text.cache_info().hits == before + 1
+    assert templating.evaluate_value("{{ count + 1 }}", {"count": 1}) == 2
+    assert templating.evaluate_value("{{ count + 1 }}", {"count": 41}) == 42
+    with pytest.raises(templating.TemplateRenderError):
+        templating.render_value(source, {"base": "/srv"})
+
+
+def test_render_mapping_returns_independent_copy_without_upfront_deepcopy():
+    from automax.core.templating import render_mapping
+
+    tags = {"web"}
+    data = {"path": "/srv/{{ release }}", "items": ["a", {"n": 1}], "tags": tags, "port": 8080}
+
+    rendered = render_mapping(data, {"release": "1.2.3"})
+
+    assert rendered == {"path": "/srv/1.2.3", "items": ["a", {"n": 1}], "tags": {"web"}, "port": 8080}
+    assert rendered["items"] is not data["items"] and rendered["items"][1] is not data["items"][1]
+    assert rendered["tags"] is not tags
+    assert data["path"] == "/srv/{{ release }}"
+
+
+def test_templating_plain_strings_skip_the_engine_with_identical_output():
+    from automax.core import templating
+
+    samples = [
+        "plain",
+        "line\n",
+        "two\n\n",
+        "\n",
+        "",
+        "a } b",
+        "echo ${HOME}",
+        "awk '{print $1}'\n",
+        "{ {",
+        "crlf\r\nline",
+    ]
+    expected = [templating._jinja_runtime().text.from_string(sample).render() for sample in samples]
+    before = templating._compile_text.cache_info()
+
+    assert [templating.render_template_string(sample, {}) for sample in samples] == expected
+    after = templating._compile_text.cache_info()
+    # Only the CR/LF sample needs the engine for newline normalisation.
+    assert (after.hits + after.misses) - (before.hits + before.misses) == 1
+
+
+def test_register_expressions_walk_cached_result_paths():
+    result = {"stdout": " 1.2.3\n", "data": {"release": {"version": "1.2.3"}, "items": ["a"]}}
+
+    assert AutomaxEngine._extract_result_value(result, "stdout.trim") == "1.2.3"
+    assert AutomaxEngine._extract_result_value(result, "data.release.version") == "1.2.3"
+    assert AutomaxEngine._extract_result_value(result, "data.missing.version") is None
+    assert AutomaxEngine._extract_result_value(result, "data.items.0") is None
+    hits = AutomaxEngine._register_path.cache_info().hits
+    AutomaxEngine._extract_result_value({"data": {"release": {"version": "2"}}}, "data.release.version")
+    assert AutomaxEngine._register_path.cache_info().hits == hits + 1
+
+
+def test_loop_conditions_compile_once_and_evaluate_per_item():
+    from automax.core import templating
+
+    engine = AutomaxEngine()
+    condition = "{{ item.active and item.port > 1024 }}"
+    items = [{"active": index % 2 == 0, "port": 1000 + index * 10} for index in range(20)]
+    before = templating._compile_native.cache_info().misses
+
+    selected = [item["port"] for item in items if engine._is_condition_true(condition, {"item": item})]
+
+    assert selected == [1040, 1060, 1080, 1100, 1120, 1140, 1160, 1180]
+    assert templating._compile_native.cache_info().misses <= before + 1
+
+
+def test_plugin_facing_models_accept_extra_attributes():
+    from automax.core.models import PluginResult
+
+    # External plugins may annotate the context or result they are handed;
+    # that must work the same on every supported Python version.
+    context = _sysops_preview_context()
+    result = PluginResult.success()
+    context.plugin_note = "seen"
+    result.plugin_note = "seen"
+
+    assert context.plugin_note == result.plugin_note == "seen"
+
+
 def test_fs_template_supports_explicit_values():
     plugin = AutomaxEngine().plugin_registry.get("fs.file.template")
 
@@ -1887,7 +1981,7 @@ def test_schema_export_emits_json_schema(tmp_path: Path):
     assert sorted(exported["required"]) == ["inventory", "job", "secrets", "vars"]
 
 
-def test_plan_format_json_outputs_machine_readable_plan(tmp_path: Path):
+def test_plan_format_json_outputs_machine_readable_plan(tmp_path: Path, monkeypatch):
     job = write(
         tmp_path / "job.yaml",
         """
@@ -1910,6 +2004,7 @@ tasks:
     )
     inventory = write(tmp_path / "inventory.yaml", "servers:\n  controller:\n    host: 127.0.0.1\n")
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(
         cli,
         ["plan", "--job", str(job), "--inventory", str(inventory), "--format", "json"],
@@ -1969,7 +2064,7 @@ tasks:
     assert marker.read_text(encoding="utf-8") == "ok"
 
 
-def test_dynamic_file_inventory_provider_resolves_relative_path(tmp_path: Path):
+def test_dynamic_file_inventory_provider_resolves_relative_path(tmp_path: Path, monkeypatch):
     included = write(
         tmp_path / "inventories" / "generated.yaml",
         """
@@ -2018,6 +2113,7 @@ tasks:
         encoding="utf-8",
     )
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(
         cli,
         ["plan", "--job", str(job), "--inventory", str(wrapper)],
@@ -2028,7 +2124,44 @@ tasks:
     assert included.exists()
 
 
-def test_dynamic_command_inventory_provider_uses_stdout_yaml(tmp_path: Path):
+def test_yaml_loader_prefers_libyaml_safe_loader(tmp_path: Path):
+    import yaml
+
+    from automax.core import yaml_loader
+
+    assert yaml_loader._SAFE_LOADER is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    path = write(tmp_path / "doc.yaml", "a: 1\nb: [x, y]\n")
+    assert yaml_loader.load_yaml_file(path) == {"a": 1, "b": ["x", "y"]}
+    with pytest.raises(yaml.YAMLError):
+        yaml_loader.safe_load("x: !!python/object/apply:os.getcwd []\n")
+
+    missing = tmp_path / "missing.yaml"
+    assert yaml_loader.load_yaml_file(missing, required=False) == {}
+    with pytest.raises(yaml_loader.YamlLoadError, match="YAML file not found"):
+        yaml_loader.load_yaml_file(missing)
+
+    broken = write(tmp_path / "bad.yaml", "a: [1\nb: 2\n")
+    with pytest.raises(yaml.YAMLError) as excinfo:
+        yaml_loader.load_yaml_file(broken)
+    assert str(broken.resolve()) in str(excinfo.value)
+
+
+def test_yaml_loader_reuses_parsed_content_without_sharing_it(tmp_path: Path, monkeypatch):
+    from automax.core import yaml_loader
+
+    first = write(tmp_path / "a.yaml", "servers:\n  web01: {host: 10.0.0.1}\n")
+    second = write(tmp_path / "b.yaml", "servers:\n  web01: {host: 10.0.0.1}\n")
+    loaded = yaml_loader.load_yaml_file(first)
+    loaded["servers"]["web01"]["host"] = "mutated"
+
+    def fail_parse(text):
+        raise AssertionError("identical content must not be parsed again")
+
+    monkeypatch.setattr(yaml_loader, "safe_load", fail_parse)
+    assert yaml_loader.load_yaml_file(second) == {"servers": {"web01": {"host": "10.0.0.1"}}}
+
+
+def test_dynamic_command_inventory_provider_uses_stdout_yaml(tmp_path: Path, monkeypatch):
     script = write(
         tmp_path / "inventory_command.py",
         """
@@ -2065,6 +2198,7 @@ tasks:
 """,
     )
 
+    monkeypatch.chdir(tmp_path)
     result = CliRunner().invoke(
         cli,
         ["plan", "--job", str(job), "--inventory", str(wrapper)],
@@ -2214,6 +2348,16 @@ tasks:
     assert svg_path.read_text(encoding="utf-8").startswith("<svg")
 
 
+def test_dot_graph_ids_are_sanitized_identifiers():
+    from automax.core.job_views import _graph_id, render_dot
+
+    assert _graph_id("step_deploy-app.v2") == "step_deploy_app_v2"
+    assert _graph_id("1st") == "n_1st"
+    view = {"job": {"name": "demo"}, "tasks": [{"id": "t-1", "steps": [{"id": "s 1", "substeps": [{"id": "ss", "plugin": "command.local.run"}]}]}]}
+    dot = render_dot(view)
+    assert "task_t_1 -> step_t_1_s_1;" in dot and 'label="ss\\ncommand.local.run"' in dot
+
+
 def test_cli_runbook_export_writes_markdown(tmp_path: Path):
     job = write(
         tmp_path / "job.yaml",
@@ -4532,6 +4676,8 @@ def _audit_sample_params(plugin) -> dict[str, object]:
         params["connection"] = {"path": "/tmp/automax.sqlite"}
     if plugin.name in {"storage.lvm.lv.remove", "storage.lvm.vg.remove", "storage.lvm.pv.remove", "data.restore.apply", "data.backup.prune", "data.backup.rotate", "network.firewall.iptables.restore"}:
         params["confirm"] = True
+    if plugin.name == "command.local.run":
+        params["shell"] = False
     if plugin.name == "automax.plugin.requirements":
         params["plugin"] = "data.transfer.rsync"
     if plugin.name == "fs.dir.remove":
@@ -5128,6 +5274,8 @@ tasks:
             str(inventory),
             "--sudo-password-env",
             "AUTOMAX_TEST_SUDO_PASSWORD",
+            "--state-dir",
+            str(tmp_path / "runs"),
         ],
     )
 
@@ -6737,3 +6885,835 @@ tasks:
     assert result.exit_code == 0, result.output
     assert "no operation needed" in result.output
     assert output.read_text(encoding="utf-8").strip() == "after"
+
+
+def test_secret_fingerprint_is_stable_keyed_and_fixed_width():
+    from automax.core.secrets import secret_fingerprint
+
+    digest = secret_fingerprint("s3cr3t-token")
+
+    assert digest == secret_fingerprint("s3cr3t-token")
+    assert digest != secret_fingerprint("other-token")
+    assert len(digest) == 16
+    assert b"s3cr3t" not in digest
+    assert secret_fingerprint(None) == secret_fingerprint("")
+
+
+def test_local_command_list_runs_without_shell_and_rejects_shell_true(monkeypatch):
+    calls: list[dict] = []
+
+    def fake_run(command, **kwargs):
+        calls.append({"command": command, **kwargs})
+
+        class Completed:
+            returncode = 0
+            stdout = "ok"
+            stderr = ""
+
+        return Completed()
+
+    monkeypatch.setattr(local_command.subprocess, "run", fake_run)
+    plugin = AutomaxEngine().plugin_registry.get("command.local.run")
+    context = _sysops_preview_context()
+    context.dry_run = False
+
+    result = plugin.execute({"command": ["printf", 1]}, context)
+
+    assert result.ok
+    assert calls[0]["command"] == ["printf", "1"]
+    assert calls[0]["shell"] is False
+    with pytest.raises(PluginValidationError, match="shell: true"):
+        plugin.validate({"command": ["printf", "x"], "shell": True})
+
+
+def test_registry_loads_external_plugin_classes_from_directory(tmp_path):
+    import threading
+
+    from automax.plugins.registry import PluginRegistry, PluginRegistryError
+
+    (tmp_path / "custom.py").write_text(
+        "from automax.core.models import PluginResult\n"
+        "from automax.plugins.base import BasePlugin\n"
+        "\n"
+        "class CustomPlugin(BasePlugin):\n"
+        "    name = 'custom.echo'\n"
+        "\n"
+        "    def execute(self, params, context):\n"
+        "        return PluginResult.success()\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "empty.txt").write_text("ignored\n", encoding="utf-8")
+    registry = PluginRegistry()
+
+    registry.load_from_paths([str(tmp_path)])
+
+    assert registry.names() == ["custom.echo"]
+    threads = [threading.Thread(target=registry.load_from_paths, args=([str(tmp_path / "custom.py")],)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.names() == ["custom.echo"]
+    with pytest.raises(PluginRegistryError, match="duplicate plugin name: custom.echo"):
+        registry.register(type(registry.get("custom.echo"))())
+    (tmp_path / "broken.py").write_text("VALUE = 1\n", encoding="utf-8")
+    with pytest.raises(PluginRegistryError, match="no BasePlugin subclasses"):
+        PluginRegistry().load_from_paths([str(tmp_path / "broken.py")])
+
+
+def test_ssh_manager_reuses_persistent_clients_and_replaces_dead_ones(monkeypatch):
+    from automax.core.ssh import SshSessionManager
+
+    class FakeTransport:
+        def __init__(self):
+            self.active = True
+
+        def is_active(self):
+            return self.active
+
+    class FakeClient:
+        def __init__(self):
+            self.transport = FakeTransport()
+            self.closed = False
+
+        def get_transport(self):
+            return self.transport
+
+        def close(self):
+            self.closed = True
+
+    opened: list[FakeClient] = []
+
+    def fake_open(self, target, paramiko):
+        opened.append(FakeClient())
+        return opened[-1]
+
+    monkeypatch.setattr(SshSessionManager, "_open_client", fake_open)
+    manager = SshSessionManager()
+    persistent = Target(name="app01", host="10.0.0.1", user="deploy", password="pw", ssh={"persistent": True})
+
+    with manager.connect(persistent) as first:
+        pass
+    with manager.connect(persistent) as second:
+        pass
+    assert first is second and not first.closed
+    first.transport.active = False
+    with manager.connect(persistent) as third:
+        pass
+    assert third is not first and first.closed
+    with manager.connect(Target(name="app02", host="10.0.0.2")) as transient:
+        pass
+    assert transient.closed
+    manager.close_all()
+    assert third.closed
+    with pytest.raises(KeyboardInterrupt):
+        with manager.connect(persistent) as interrupted:
+            raise KeyboardInterrupt
+    assert interrupted.closed and not manager._pool
+
+
+def test_http_requests_share_one_opener_and_keep_alive_connection():
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    import automax.plugins.http as http_plugins
+    from automax.plugins.http_pool import close_idle_connections
+
+    client_ports: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            client_ports.append(self.client_address[1])
+            body = b"pong" if self.path == "/ping" else b"x" * 200_000
+            self.send_response(200 if self.path == "/ping" else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_HEAD(self):
+            client_ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", "500000000")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/ping"
+        first = http_plugins._perform({"url": url})
+        second = http_plugins._perform({"url": url})
+        missing = http_plugins._perform({"url": url.replace("/ping", "/big")})
+        head = http_plugins._perform({"url": url, "method": "HEAD"})
+    finally:
+        # Idle pooled sockets keep the single-threaded server inside its handler.
+        close_idle_connections()
+        server.shutdown()
+        server.server_close()
+
+    assert first["status"] == second["status"] == 200
+    assert second["body"] == "pong"
+    assert missing["status"] == 404 and missing["body"] == "x" * 200_000
+    assert head["status"] == 200 and head["body"] == ""
+    assert len(set(client_ports)) == 1
+    assert http_plugins._opener(True) is http_plugins._opener(True)
+    assert http_plugins._opener(False) is not http_plugins._opener(True)
+
+
+def test_http_body_read_does_not_presize_from_large_content_length():
+    import automax.plugins.http as http_plugins
+
+    class FakeResponse:
+        headers = {"Content-Length": str(50 * 1024 * 1024 * 1024)}
+
+        def read(self):
+            return b"short"
+
+        def readinto(self, buffer):
+            raise AssertionError("oversized Content-Length must not presize a buffer")
+
+    assert http_plugins._read_body(FakeResponse(), "utf-8", "GET", 200) == "short"
+    assert http_plugins._read_body(FakeResponse(), "utf-8", "GET", 304) == "short"
+
+
+def test_mail_send_reuses_authenticated_smtp_session(monkeypatch):
+    import smtplib
+
+    import automax.plugins.mail as mail_plugins
+
+    sessions: list = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            self.logins = 0
+            self.sent = 0
+            self.alive = True
+            self.drop = None
+            self.closed = False
+            sessions.append(self)
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            self.logins += 1
+
+        def noop(self):
+            return (250, b"OK") if self.alive else (421, b"closing")
+
+        def mail(self, sender):
+            if self.drop == "mail":
+                raise smtplib.SMTPServerDisconnected("gone")
+            return (250, b"OK")
+
+        def send_message(self, msg, to_addrs=None):
+            self.mail(msg["From"])
+            self.sent += 1
+
+        def sendmail(self, from_addr, to_addrs, payload):
+            self.mail(from_addr)
+            if self.drop == "data":
+                raise smtplib.SMTPServerDisconnected("gone after DATA")
+            self.sent += 1
+            self.last = (from_addr, to_addrs, payload)
+
+        def quit(self):
+            self.closed = True
+
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(mail_plugins, "_SMTP_POOL", {})
+    plugin = AutomaxEngine().plugin_registry.get("notify.mail.send")
+    context = _sysops_preview_context()
+    context.dry_run = False
+    params = {"smtp_host": "smtp.example.com", "from": "a@example.com", "to": "b@example.com", "subject": "hi", "username": "bot", "password": "pw"}
+
+    plugin.execute(params, context)
+    plugin.execute(params, context)
+    assert len(sessions) == 1
+    assert sessions[0].logins == 1 and sessions[0].sent == 2
+
+    sessions[0].alive = False
+    plugin.execute(params, context)
+    assert len(sessions) == 2
+    assert sessions[0].closed and sessions[1].sent == 1
+
+    sessions[1].drop = "mail"
+    plugin.execute(params, context)
+    assert len(sessions) == 3 and sessions[2].sent == 1
+
+    sessions[2].drop = "data"
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        plugin.execute(params, context)
+    assert len(sessions) == 3 and sessions[2].closed
+
+
+def test_rsync_ssh_multiplex_adds_control_master_options():
+    plugin = AutomaxEngine().plugin_registry.get("data.transfer.rsync")
+    context = _sysops_preview_context()
+
+    command = plugin._command_parts({"src": "dist/", "dest": "/srv/app/", "ssh_multiplex": True, "ssh_options": ["-p", "2222"]}, context)
+    shell = command[command.index("-e") + 1]
+    assert shell.startswith("ssh -o ControlMaster=auto -o ControlPath=~/.ssh/automax-cm-%C -o ControlPersist=60s")
+    assert shell.endswith(" -p 2222")
+    assert command.count("-e") == 1
+    local = plugin._command_parts({"src": "a/", "dest": "b/", "direction": "local", "ssh_multiplex": True}, context)
+    assert "-e" not in local
+    excluded = plugin._command_parts({"src": "dist/", "dest": "/srv/app/", "ssh_multiplex": True, "excludes": ["-e"]}, context)
+    assert excluded[excluded.index("--exclude") + 1] == "-e"
+    assert excluded[excluded.index("-e") + 1].startswith("ssh -o ControlMaster=auto")
+
+
+def test_plugins_list_filters_by_category_from_registry_index():
+    from automax.plugins.registry import build_builtin_registry
+
+    registry = build_builtin_registry()
+    network = registry.names(category="network")
+
+    assert network and all(name.startswith("network.") for name in network)
+    assert "network" in registry.categories()
+    assert registry.names(category="missing") == []
+    result = CliRunner().invoke(cli_module.cli, ["plugins", "list", "--category", "network"])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == network
+    unknown = CliRunner().invoke(cli_module.cli, ["plugins", "list", "--category", "missing"])
+    assert unknown.exit_code != 0
+    assert "unknown plugin category: missing" in unknown.output
+
+
+def test_registry_category_listing_includes_aliases_on_request():
+    from automax.plugins.base import BasePlugin
+    from automax.plugins.registry import PluginRegistry
+
+    class AliasedPlugin(BasePlugin):
+        name = "demo.thing.run"
+        aliases = ("demo.thing.exec",)
+
+        def execute(self, params, context):
+            raise NotImplementedError
+
+    registry = PluginRegistry()
+    registry.register(AliasedPlugin())
+
+    assert registry.names(category="demo") == ["demo.thing.run"]
+    assert registry.names(category="demo", include_aliases=True) == ["demo.thing.exec", "demo.thing.run"]
+
+
+def test_plugin_substep_vars_are_merged_per_target_without_touching_shared_vars():
+    from copy import deepcopy
+
+    from automax.core.models import PluginResult, Target
+    from automax.plugins.base import BasePlugin
+
+    seen: list[dict] = []
+
+    class RecordingPlugin(BasePlugin):
+        name = "demo.vars.record"
+        required_params = ("label",)
+
+        def execute(self, params, context):
+            seen.append(deepcopy(context.vars))
+            context.vars["settings"]["mutated"] = True
+            return PluginResult.success(message=params["label"])
+
+    engine = AutomaxEngine()
+    engine.plugin_registry.register(RecordingPlugin())
+    variables = {"settings": {"tier": "base"}, "region": "eu"}
+    target = Target(name="web01", host="127.0.0.1", vars={"region": "us"})
+
+    result = engine._execute_substep(
+        job={},
+        task={},
+        step={},
+        substep={"id": "rec", "use": "demo.vars.record", "with": {"label": "{{ vars.region }}-{{ loop_value }}"}},
+        target=target,
+        run_id="test-run",
+        dry_run=False,
+        variables=variables,
+        secrets={},
+        outputs={},
+        ssh_client=None,
+        step_state={"vars": {"step_var": 1}},
+        flow_vars={"loop_value": "x"},
+    )
+
+    assert result.ok and result.message == "us-x"
+    assert seen == [{"settings": {"tier": "base"}, "region": "us", "step_var": 1, "loop_value": "x"}]
+    assert variables == {"settings": {"tier": "base"}, "region": "eu"}
+
+
+def test_read_remote_output_drains_stderr_while_stdout_is_open():
+    import threading
+
+    from automax.plugins.remote_utils import read_remote_output
+
+    stderr_drained = threading.Event()
+
+    class FakeChannel:
+        def recv_exit_status(self):
+            return 3
+
+    class FakeStdout:
+        channel = FakeChannel()
+
+        def read(self):
+            # A remote command blocked on a full stderr window never closes stdout.
+            assert stderr_drained.wait(timeout=5)
+            return b"out"
+
+    class FakeStderr:
+        def read(self):
+            stderr_drained.set()
+            return b"err"
+
+    assert read_remote_output(FakeStdout(), FakeStderr()) == (3, b"out", b"err")
+
+
+def test_builtin_metadata_is_resolved_once_per_plugin_class():
+    from automax.plugins.registry import build_builtin_registry
+
+    first = build_builtin_registry().get("data.transfer.rsync")
+    second = build_builtin_registry().get("data.transfer.rsync")
+
+    assert first is not second
+    assert first.parameter_schema is second.parameter_schema
+    assert first.metadata() == second.metadata()
+    assert "ssh_multiplex" in first.optional_params
+    with pytest.raises(TypeError):
+        first.parameter_schema["src"]["description"] = "changed"
+    with pytest.raises(TypeError):
+        first.result_fields["ok"] = "changed"
+
+
+def test_http_wait_builds_result_data_only_for_final_response(monkeypatch):
+    from email.message import Message
+
+    import automax.plugins.http as http_plugins
+
+    headers = Message()
+    headers["Content-Type"] = "text/plain"
+    responses = iter([503, 503, 200])
+    monkeypatch.setattr(http_plugins, "_perform", lambda params: {"status": next(responses), "headers": headers, "body": "ok", "error": ""})
+    built: list[int] = []
+    original = http_plugins._response_data
+    monkeypatch.setattr(http_plugins, "_response_data", lambda response: built.append(response["status"]) or original(response))
+    monkeypatch.setattr(http_plugins.time, "sleep", lambda seconds: None)
+
+    result = AutomaxEngine().plugin_registry.get("network.http.wait").execute(
+        {"url": "https://example.com/health", "status": 200, "timeout": 30, "interval": 1},
+        _remote_context_for_result(0),
+    )
+
+    assert result.ok and result.data["matches"] is True
+    assert result.data["headers"] == {"Content-Type": "text/plain"}
+    assert built == [200]
+
+
+def test_mail_send_reuses_serialized_message_for_new_recipients(monkeypatch):
+    import automax.plugins.mail as mail_plugins
+
+    sent: list = []
+
+    class FakeSMTP:
+        def noop(self):
+            return (250, b"OK")
+
+        def mail(self, sender):
+            return (250, b"OK")
+
+        def sendmail(self, from_addr, to_addrs, payload):
+            self.mail(from_addr)
+            sent.append((from_addr, to_addrs, payload))
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(mail_plugins, "_checkout_smtp", lambda key, params: (FakeSMTP(), False))
+    monkeypatch.setattr(mail_plugins, "_SMTP_POOL", {})
+    mail_plugins._shared_message_bytes.cache_clear()
+    plugin = AutomaxEngine().plugin_registry.get("notify.mail.send")
+    context = _sysops_preview_context()
+    context.dry_run = False
+    base = {"smtp_host": "smtp.example.com", "from": "Automax <bot@example.com>", "subject": "Nightly report", "body": "all green\n"}
+
+    plugin.execute({**base, "to": "ops@example.com"}, context)
+    plugin.execute({**base, "to": ["dev@example.com"], "cc": "lead@example.com", "bcc": "audit@example.com"}, context)
+
+    assert mail_plugins._shared_message_bytes.cache_info().hits == 1
+    assert sent[0][0] == "bot@example.com"
+    assert sent[1][1] == ["dev@example.com", "lead@example.com", "audit@example.com"]
+    payload = sent[1][2]
+    assert payload.startswith(b"To: dev@example.com\r\nCc: lead@example.com\r\nFrom: Automax <bot@example.com>\r\n")
+    assert b"audit@example.com" not in payload
+    assert payload.endswith(b"\r\n\r\nall green\r\n")
+
+
+def test_http_pool_retries_dead_reused_connection_only_for_idempotent_methods(monkeypatch):
+    from urllib.error import URLError
+    from urllib.request import Request
+
+    import automax.plugins.http_pool as http_pool
+
+    attempts: list[str] = []
+
+    class DeadConnection:
+        def request(self, method, *args, **kwargs):
+            attempts.append(method)
+            raise ConnectionResetError("peer closed idle connection")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(http_pool, "_checkout", lambda key, http_class, req, conn_args: (DeadConnection(), True))
+
+    for method, expected in (("POST", 1), ("GET", 2)):
+        attempts.clear()
+        with pytest.raises(URLError):
+            http_pool._pooled_open(None, object, Request("http://example.invalid/", data=b"x" if method == "POST" else None, method=method))
+        assert attempts == [method] * expected
+
+
+def test_upload_bytes_to_temp_pipelines_sftp_writes():
+    from automax.plugins.file_utils import upload_bytes_to_temp
+
+    events: list = []
+
+    class FakeHandle:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            events.append("close")
+
+        def set_pipelined(self, pipelined=True):
+            events.append(("pipelined", pipelined))
+
+        def write(self, data):
+            events.append(("write", len(data)))
+
+    class FakeSftp:
+        def file(self, path, mode):
+            events.append(("open", mode))
+            return FakeHandle()
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSftp()
+
+    context = _sysops_preview_context()
+    context.ssh_client = FakeClient()
+
+    path = upload_bytes_to_temp(context, b"x" * 100_000, suffix=".bin")
+
+    assert path.startswith("/tmp/automax-test-run-") and path.endswith(".bin")
+    assert events == [("open", "wb"), ("pipelined", True), ("write", 100_000), "close"]
+
+
+def test_upload_text_to_temp_streams_large_text_in_encoded_chunks(monkeypatch):
+    import automax.plugins.file_utils as file_utils
+
+    writes: list[bytes] = []
+    removed: list[str] = []
+
+    class FakeHandle:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return None
+
+        def set_pipelined(self, pipelined=True):
+            pass
+
+        def write(self, data):
+            writes.append(bytes(data))
+
+    class FakeSftp:
+        def file(self, path, mode):
+            return FakeHandle()
+
+        def remove(self, path):
+            removed.append(path)
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSftp()
+
+    monkeypatch.setattr(file_utils, "_TEXT_CHUNK_CHARS", 4)
+    context = _sysops_preview_context()
+    context.ssh_client = FakeClient()
+    text = "caffè, ünïcode\n"
+
+    for encoding in ("utf-8", "utf-16"):
+        writes.clear()
+        file_utils.upload_text_to_temp(context, text, encoding=encoding)
+        assert len(writes) > 1
+        assert b"".join(writes) == text.encode(encoding)
+
+    with pytest.raises(UnicodeEncodeError):
+        file_utils.upload_text_to_temp(context, text, encoding="ascii")
+    assert len(removed) == 1 and removed[0].endswith(".txt")
+
+
+def test_tar_extract_threads_prefers_pigz_for_gzip_archives():
+    plugin = AutomaxEngine().plugin_registry.get("data.archive.tar.extract")
+    context = _sysops_preview_context()
+
+    command = plugin.manual_commands({"archive": "/tmp/app.tgz", "dest": "/opt/app", "threads": 4}, context)[0]
+    assert command.startswith("{ if command -v pigz >/dev/null 2>&1; then automax_inflate='pigz -p 4'; else automax_inflate=gzip; fi && ")
+    assert command.count('tar --use-compress-program="$automax_inflate"') == 2
+    for params in ({"archive": "/tmp/app.tar.xz", "dest": "/opt/app", "threads": 4}, {"archive": "/tmp/app.tar.gz", "dest": "/opt/app"}):
+        assert "pigz" not in plugin.manual_commands(params, context)[0]
+    with pytest.raises(PluginValidationError, match="threads"):
+        plugin.validate({"archive": "/tmp/app.tgz", "dest": "/opt/app", "threads": 0})
+
+
+def test_archive_auto_compression_follows_file_name_suffix():
+    from automax.plugins.archive import _stream_tool, _tar_create_flag
+
+    expected = {
+        "/srv/app.tar.gz": "-czf",
+        "/srv/app.tgz": "-czf",
+        "/srv/app-1.2.tar.bz2": "-cjf",
+        "/srv/app.tbz2": "-cjf",
+        "/srv/app.tar.xz": "-cJf",
+        "/srv/app.txz": "-cJf",
+        "/srv/app.tar": "-cf",
+        "/srv/app.gz": "-cf",
+    }
+    assert {dest: _tar_create_flag(dest, "auto") for dest in expected} == expected
+    assert [_stream_tool(path, "auto", action="compress") for path in ("a.log.gz", "a.bz2", "a.tar.xz")] == ["gzip", "bzip2", "xz"]
+    with pytest.raises(PluginValidationError, match="requires .gz, .bz2 or .xz suffix"):
+        _stream_tool("/srv/app.zst", "auto", action="compress")
+
+
+def test_directory_upload_runs_one_remote_mkdir_for_the_whole_tree(tmp_path, monkeypatch):
+    import automax.plugins.transfer as transfer
+
+    (tmp_path / "app" / "conf").mkdir(parents=True)
+    (tmp_path / "app" / "a.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "app" / "conf" / "b.txt").write_text("b", encoding="utf-8")
+    commands: list[str] = []
+    monkeypatch.setattr(transfer, "exec_remote", lambda context, command, **kwargs: commands.append(command) or (0, "", ""))
+
+    class FakeSftp:
+        def __init__(self):
+            self.dirs: list[str] = []
+            self.files: list[str] = []
+
+        def mkdir(self, path):
+            self.dirs.append(path)
+
+        def put(self, local, remote, confirm=True):
+            # The server acknowledges each write; no size re-stat per file.
+            assert confirm is False
+            self.files.append(remote)
+
+    sftp = FakeSftp()
+    transfer._upload_dir(_sysops_preview_context(), sftp, tmp_path / "app", "/srv/app")
+
+    assert commands == ["mkdir -p /srv/app"]
+    assert sftp.dirs == ["/srv/app/conf"]
+    assert sorted(sftp.files) == ["/srv/app/a.txt", "/srv/app/conf/b.txt"]
+
+
+def test_sftp_mkdir_reports_the_mkdir_error_when_stat_also_fails():
+    import stat as stat_module
+    from types import SimpleNamespace
+
+    import automax.plugins.transfer as transfer
+
+    class FakeSftp:
+        def __init__(self, existing_mode=None):
+            self.existing_mode = existing_mode
+
+        def mkdir(self, path):
+            raise PermissionError(13, "Permission denied", path)
+
+        def stat(self, path):
+            if self.existing_mode is None:
+                raise FileNotFoundError(2, "No such file", path)
+            return SimpleNamespace(st_mode=self.existing_mode)
+
+    transfer._sftp_mkdir(FakeSftp(stat_module.S_IFDIR | 0o755), "/srv/app/conf")
+    with pytest.raises(PermissionError):
+        transfer._sftp_mkdir(FakeSftp(), "/srv/app/conf")
+    with pytest.raises(PermissionError):
+        transfer._sftp_mkdir(FakeSftp(stat_module.S_IFREG | 0o644), "/srv/app/conf")
+
+
+def test_sudo_upload_of_missing_source_fails_locally(tmp_path, monkeypatch):
+    import automax.plugins.transfer as transfer
+
+    remote: list[str] = []
+    monkeypatch.setattr(transfer, "exec_remote", lambda context, command, **kwargs: (0, "", ""))
+    monkeypatch.setattr(transfer, "install_uploaded_file", lambda *args, **kwargs: remote.append("install") or (0, "", ""))
+
+    class FakeSftp:
+        def put(self, local, remote_path, confirm=True):
+            remote.append(remote_path)
+            Path(local).read_bytes()
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSftp()
+
+    context = _sysops_preview_context()
+    context.dry_run = False
+    context.ssh_client = FakeClient()
+    # A templated source is only checked for existence at execution time.
+    missing = str(tmp_path / "{{ 'missing' }}.conf")
+
+    with pytest.raises(FileNotFoundError):
+        transfer.TransferUploadPlugin().execute({"src": missing, "dest": "/etc/app.conf", "sudo": True}, context)
+    assert "install" not in remote and not any(path.startswith("/tmp/automax-upload-") for path in remote)
+
+
+def test_download_backup_existing_copies_local_file_before_overwrite(tmp_path):
+    plugin = AutomaxEngine().plugin_registry.get("data.transfer.download")
+    dest = tmp_path / "app.conf"
+    dest.write_bytes(b"old\n")
+    dest.chmod(0o640)
+
+    class FakeSftp:
+        def stat(self, path):
+            return os.stat_result((0o100644, 0, 0, 1, 0, 0, 4, 0, 0, 0))
+
+        def get(self, remote, local):
+            Path(local).write_bytes(b"new\n")
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSftp()
+
+    context = _sysops_preview_context()
+    context.dry_run = False
+    context.ssh_client = FakeClient()
+
+    result = plugin.execute({"src": "/etc/app.conf", "dest": str(dest), "backup_existing": True}, context)
+
+    assert result.ok
+    backup = tmp_path / "app.conf.bak"
+    assert backup.read_bytes() == b"old\n" and dest.read_bytes() == b"new\n"
+    assert backup.stat().st_mode & 0o777 == 0o640
+
+
+def test_directory_download_reuses_listing_attrs_instead_of_restat(tmp_path):
+    import stat as stat_module
+    from types import SimpleNamespace
+
+    plugin = AutomaxEngine().plugin_registry.get("data.transfer.download")
+    stats: list[str] = []
+
+    def attrs(name, mode, mtime):
+        return SimpleNamespace(filename=name, st_mode=mode, st_atime=mtime, st_mtime=mtime)
+
+    tree = {
+        "/srv/app": [attrs("conf", stat_module.S_IFDIR | 0o755, 2000), attrs("a.txt", stat_module.S_IFREG | 0o644, 3000)],
+        "/srv/app/conf": [attrs("b.txt", stat_module.S_IFREG | 0o644, 4000)],
+    }
+
+    class FakeSftp:
+        def stat(self, path):
+            stats.append(path)
+            return attrs("app", stat_module.S_IFDIR | 0o755, 1000)
+
+        def listdir_attr(self, path):
+            return tree[path]
+
+        def get(self, remote, local):
+            Path(local).write_text(remote, encoding="utf-8")
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSftp()
+
+    context = _sysops_preview_context()
+    context.dry_run = False
+    context.ssh_client = FakeClient()
+    dest = tmp_path / "app"
+
+    result = plugin.execute({"src": "/srv/app", "dest": str(dest), "recursive": True, "preserve_times": True}, context)
+
+    assert result.ok
+    assert stats == ["/srv/app"]
+    assert (dest / "conf" / "b.txt").read_text(encoding="utf-8") == "/srv/app/conf/b.txt"
+    assert [int(path.stat().st_mtime) for path in (dest, dest / "conf", dest / "a.txt", dest / "conf" / "b.txt")] == [1000, 2000, 3000, 4000]
+
+
+def test_directory_download_creates_each_local_directory_once(tmp_path, monkeypatch):
+    import stat as stat_module
+    from types import SimpleNamespace
+
+    import automax.plugins.transfer as transfer
+
+    entries = [SimpleNamespace(filename=f"f{index}.txt", st_mode=stat_module.S_IFREG | 0o644) for index in range(3)]
+
+    class FakeSftp:
+        def listdir_attr(self, path):
+            return entries
+
+        def get(self, remote, local):
+            Path(local).write_bytes(b"x")
+
+    created: list[Path] = []
+    original_mkdir = Path.mkdir
+
+    def recording_mkdir(self, *args, **kwargs):
+        created.append(self)
+        return original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", recording_mkdir)
+    transfer._download_dir(FakeSftp(), "/srv/app", tmp_path / "app")
+
+    assert created == [tmp_path / "app"]
+    assert sorted(path.name for path in (tmp_path / "app").iterdir()) == ["f0.txt", "f1.txt", "f2.txt"]
+
+
+def test_local_sha256_matches_hashlib_with_and_without_file_digest(tmp_path, monkeypatch):
+    import hashlib
+
+    import automax.plugins.transfer as transfer
+
+    payload = os.urandom(transfer._HASH_CHUNK_SIZE * 2 + 123)
+    path = tmp_path / "payload.bin"
+    path.write_bytes(payload)
+    expected = hashlib.sha256(payload).hexdigest()
+
+    assert transfer._sha256_file(path) == expected
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    assert transfer._sha256_file(path) == expected
+
+
+def test_local_sha256_hints_sequential_read(tmp_path, monkeypatch):
+    import automax.plugins.transfer as transfer
+
+    if not hasattr(os, "posix_fadvise"):
+        pytest.skip("posix_fadvise is not available on this platform")
+    advice: list[int] = []
+    monkeypatch.setattr(os, "posix_fadvise", lambda fd, offset, length, hint: advice.append(hint))
+    path = tmp_path / "payload.bin"
+    path.write_bytes(b"payload")
+
+    transfer._sha256_file(path)
+
+    assert advice == [os.POSIX_FADV_SEQUENTIAL]